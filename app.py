@@ -6,8 +6,32 @@ import base64
 import pandas as pd
 from datetime import datetime
 import traceback
-from PIL import Image
+from PIL import Image, ImageDraw
 from io import BytesIO
+import threading
+import random
+import re
+import codecs
+import os
+import sqlite3
+from contextlib import closing
+from collections import deque, OrderedDict
+import hashlib
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Optional faster JSON libraries
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
 
 # Page configuration
 st.set_page_config(
@@ -30,6 +54,14 @@ if "api_errors" not in st.session_state:
     st.session_state.api_errors = []
 if "last_api_check" not in st.session_state:
     st.session_state.last_api_check = None
+if "avatar_page" not in st.session_state:
+    st.session_state.avatar_page = 1
+if "avatar_search_last" not in st.session_state:
+    st.session_state.avatar_search_last = ""
+if "requested_downloads" not in st.session_state:
+    st.session_state.requested_downloads = set()
+if "local_playback" not in st.session_state:
+    st.session_state.local_playback = set()
 
 # Sidebar for API key and settings
 with st.sidebar:
@@ -47,6 +79,9 @@ with st.sidebar:
         refresh_interval = st.slider("Refresh interval (seconds)", 5, 60, 15)
         show_debug = st.checkbox("Show debug information", value=True)  # Set to True by default for now
         use_mock_data = st.checkbox("Use mock data if API fails", value=True)
+        pool_size = st.slider("Connection pool size (per host)", 1, 50, 10)
+        retry_budget_seconds = st.slider("Retry budget per rerun (seconds)", 0, 60, 20)
+        download_segments = st.slider("Parallel download segments (1 = single stream)", 1, 8, 1)
     
     # About section
     with st.expander("About"):
@@ -99,6 +134,403 @@ headers = {
     "Authorization": f"Key {api_key}"
 }
 
+# Pluggable JSON codec: the fastest installed library, falling back to the standard library
+def stdlib_json_loads(data):
+    return json.loads(data)
+
+def stdlib_json_dumps(obj):
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+if orjson is not None:
+    JSON_CODEC = "orjson"
+    # orjson.JSONDecodeError already subclasses json.JSONDecodeError
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+elif ujson is not None:
+    JSON_CODEC = "ujson"
+
+    def json_loads(data):
+        try:
+            return ujson.loads(data)
+        except ValueError as e:
+            doc = data.decode("utf-8", "replace") if isinstance(data, bytes) else data
+            raise json.JSONDecodeError(str(e), doc, 0) from e
+
+    def json_dumps(obj):
+        return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+else:
+    JSON_CODEC = "json (stdlib)"
+    json_loads = stdlib_json_loads
+    json_dumps = stdlib_json_dumps
+
+# Function to compare the active JSON codec with the standard library on a synthetic catalog
+def benchmark_json_codec(record_count, repeat=5):
+    """Return best-of-repeat timings (ms) for decoding and encoding a catalog of record_count voices"""
+    catalog = {"voices": [
+        {
+            "id": f"voice-{i:06d}",
+            "name": f"Voice {i}",
+            "gender": ("Male", "Female")[i % 2],
+            "language": ("English", "Spanish", "German", "French")[i % 4],
+            "accent": ("American", "British", "Australian", "Latin American")[i % 4],
+            "previewAudioUrl": f"https://cdn.pipio.ai/voices/{i}/preview.mp3",
+            "tags": ["narration", "conversational", "news"][: 1 + i % 3],
+            "sampleRate": 44100,
+            "rating": 4.5 + (i % 5) / 10,
+        }
+        for i in range(record_count)
+    ]}
+    payload = stdlib_json_dumps(catalog)
+    codecs_under_test = [("json (stdlib)", stdlib_json_loads, stdlib_json_dumps)]
+    if JSON_CODEC != "json (stdlib)":
+        codecs_under_test.append((JSON_CODEC, json_loads, json_dumps))
+    
+    results = []
+    for codec_name, loads, dumps in codecs_under_test:
+        for operation, run in (("decode", lambda: loads(payload)), ("encode", lambda: dumps(catalog))):
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - started)
+            results.append({"Codec": codec_name, "Operation": operation, "Records": record_count,
+                            "Payload (KB)": round(len(payload) / 1024), "Best (ms)": round(best * 1000, 2)})
+    return results
+
+# Retry policies for the different kinds of Pipio endpoints
+class RetryPolicy:
+    """How often and on which failures an endpoint may be retried"""
+
+    def __init__(self, max_attempts=3, retry_statuses=(429, 500, 502, 503, 504),
+                 idempotent=True, base_delay=0.5, max_delay=8.0, max_retry_after=30.0):
+        self.max_attempts = max_attempts
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent = idempotent
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def should_retry_exception(self, exc):
+        # A non-idempotent request may only be repeated if it never reached the server
+        if not self.idempotent:
+            return isinstance(exc, requests.exceptions.ConnectTimeout)
+        return isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff for the given (zero-based) attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+RETRY_POLICIES = {
+    "catalog": RetryPolicy(max_attempts=4),
+    "status": RetryPolicy(max_attempts=3),
+    # Only retry generation when the server explicitly rejected it without processing
+    "generate": RetryPolicy(max_attempts=3, retry_statuses=(429, 503), idempotent=False),
+    "download": RetryPolicy(max_attempts=3),
+    # Preview images are optional; give up quickly and show the original URL instead
+    "thumbnail": RetryPolicy(max_attempts=2, base_delay=0.25, max_delay=1.0),
+}
+
+# Total retry budget shared by every request made during one rerun
+class RetryBudget:
+    """Caps the time a single rerun may spend sleeping between retries"""
+
+    def __init__(self, seconds):
+        self.remaining = float(seconds)
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def spend(self, delay):
+        """Reserve delay seconds of the budget, returning False if it is exhausted"""
+        with self._lock:
+            if delay > self.remaining:
+                return False
+            self.remaining -= delay
+            self.retries += 1
+            return True
+
+# Function to parse a Retry-After header (seconds or HTTP date)
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+retry_budget = RetryBudget(retry_budget_seconds)
+
+# Circuit breaker settings shared by every Pipio host
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_TIMEOUT = 30.0
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised without touching the network while a host's circuit is open"""
+
+class CircuitBreaker:
+    """Opens after consecutive failures, fails fast, then half-opens with a single probe"""
+
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"Circuit for {self.name} host is open; failing fast")
+                self.state = "half_open"
+                self._probe_in_flight = False
+            if self.state == "half_open":
+                if self._probe_in_flight:
+                    raise CircuitOpenError(f"Circuit for {self.name} host is half-open; probe in progress")
+                self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Let another request probe after one that ended without a verdict on the host"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self):
+        self.record_success()
+
+    def snapshot(self):
+        """Return the breaker state for display in the API Status tab"""
+        with self._lock:
+            retry_in = None
+            if self.state == "open":
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            return {
+                "Host": self.name,
+                "State": self.state,
+                "Consecutive Failures": self.failures,
+                "Retry In (s)": round(retry_in, 1) if retry_in is not None else None,
+            }
+
+# Function to map a URL to its circuit breaker group
+def circuit_name(url):
+    host = urlparse(url).netloc
+    if host == "avatar.pipio.ai":
+        return "avatar"
+    if host == "generate.pipio.ai":
+        return "generate"
+    # Everything else is video content served from the CDN
+    return "cdn"
+
+@st.cache_resource
+def get_circuit_breakers():
+    """Create one circuit breaker per Pipio host group, once per process"""
+    # Preview images are fetched through their own "images" group so a dead image host cannot block video downloads
+    return {name: CircuitBreaker(name) for name in ("avatar", "generate", "cdn", "images")}
+
+# Shared HTTP client with keep-alive connection pools per Pipio host
+class PipioClient:
+    """Process-wide HTTP client that reuses warm connections across reruns and sessions"""
+
+    def __init__(self, pool_size=10, breakers=None):
+        self.pool_size = pool_size
+        self.breakers = breakers if breakers is not None else {}
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        """Return the pooled session for the host of the given URL"""
+        host = urlparse(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                self._mount(session)
+                self._sessions[host] = session
+        return session
+
+    def _mount(self, session):
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def resize(self, pool_size):
+        """Change the per-host pool size in place, closing the old pools"""
+        with self._lock:
+            if pool_size == self.pool_size:
+                return
+            self.pool_size = pool_size
+            for session in self._sessions.values():
+                old_adapters = set(session.adapters.values())
+                self._mount(session)
+                # Idle connections are closed now; in-flight ones are discarded when released
+                for adapter in old_adapters:
+                    adapter.close()
+
+    def request(self, method, url, policy=None, budget=None, circuit=None, **kwargs):
+        """Send a request through the host's circuit breaker (or the named one), retrying transient failures according to policy"""
+        session = self.session_for(url)
+        breaker = self.breakers.get(circuit or circuit_name(url))
+        if breaker is None:
+            return self._send(session, method, url, policy, budget, **kwargs)
+        
+        # The breaker sees one outcome per request, however many attempts the retry policy made
+        breaker.before_request()
+        try:
+            response = self._send(session, method, url, policy, budget, **kwargs)
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release_probe()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def _send(self, session, method, url, policy, budget, **kwargs):
+        """Send a request, retrying transient failures according to policy"""
+        max_attempts = policy.max_attempts if policy is not None else 1
+
+        attempt = 0
+        while True:
+            try:
+                response = session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if attempt + 1 >= max_attempts or not policy.should_retry_exception(e):
+                    raise
+                delay = policy.backoff(attempt)
+                if budget is not None and not budget.spend(delay):
+                    raise
+            else:
+                if attempt + 1 >= max_attempts or response.status_code not in policy.retry_statuses:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    if retry_after > policy.max_retry_after:
+                        return response
+                    delay = retry_after
+                else:
+                    delay = policy.backoff(attempt)
+                if budget is not None and not budget.spend(delay):
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+@st.cache_resource
+def get_pipio_client(_breakers):
+    """Create the shared Pipio client once per process"""
+    return PipioClient(breakers=_breakers)
+
+circuit_breakers = get_circuit_breakers()
+client = get_pipio_client(circuit_breakers)
+# One client serves every session, so the most recently chosen pool size applies to all of them
+client.resize(pool_size)
+
+# Function to derive a stable, non-reversible identifier for an API key
+def hash_api_key(api_key):
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+# Client-side rate limits per endpoint class: (tokens per second, burst size)
+RATE_LIMITS = {
+    "generate": (0.5, 3),
+    "status": (2.0, 5),
+}
+# Longest a request may queue locally before it is shed
+RATE_LIMIT_MAX_WAIT = 10.0
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Raised when a request is shed locally instead of being sent to Pipio"""
+
+class TokenBucket:
+    """Thread-safe token bucket that queues callers until a token is available"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait):
+        """Take one token, waiting at most max_wait seconds; returns False if shed"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if wait > max_wait:
+                return False
+            # Reserve the token now so that queued callers are served in order
+            self.tokens -= 1
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+class RateLimiter:
+    """Process-wide token buckets keyed by (API key hash, endpoint class)"""
+
+    def __init__(self, limits):
+        self.limits = limits
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, api_key, endpoint_class, max_wait=RATE_LIMIT_MAX_WAIT):
+        key = (hash_api_key(api_key), endpoint_class)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(*self.limits[endpoint_class])
+                self._buckets[key] = bucket
+        if not bucket.acquire(max_wait):
+            raise RateLimitExceeded(f"Local rate limit reached for {endpoint_class} requests; please retry shortly")
+
+@st.cache_resource
+def get_rate_limiter():
+    """Create the shared rate limiter once per process"""
+    return RateLimiter(RATE_LIMITS)
+
+rate_limiter = get_rate_limiter()
+
+# Function to check whether the current thread belongs to a user's script run
+def in_script_run():
+    return get_script_run_ctx(suppress_warning=True) is not None
+
+@st.cache_resource
+def get_background_errors():
+    """Process-wide log of errors raised by background workers"""
+    return deque(maxlen=100)
+
+background_errors = get_background_errors()
+
 # Function to log API errors
 def log_api_error(endpoint, error_type, error_message, response_data=None):
     """Log API errors for troubleshooting"""
@@ -109,7 +541,11 @@ def log_api_error(endpoint, error_type, error_message, response_data=None):
         "error_message": error_message,
         "response_data": response_data
     }
-    st.session_state.api_errors.append(error_entry)
+    if in_script_run():
+        st.session_state.api_errors.append(error_entry)
+    else:
+        # Background workers have no session to report to
+        background_errors.append(error_entry)
     return error_entry
 
 # Function to safely get value from dictionary
@@ -192,58 +628,361 @@ def get_mock_voices():
         }
     ]
 
-# Function to fetch avatars with caching
-@st.cache_data(ttl=600)
-def get_avatars(api_key):
+# Sentinel returned by catalog fetchers when the server answered 304 Not Modified
+NOT_MODIFIED = "not-modified"
+
+# Function to build conditional request headers from stored validators
+def conditional_headers(validators):
+    request_headers = {}
+    if validators:
+        if validators.get("etag"):
+            request_headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            request_headers["If-Modified-Since"] = validators["last_modified"]
+    return request_headers
+
+# Function to extract cache validators from a catalog response
+def response_validators(response):
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+# Declarative description of how each endpoint's response is shaped into records
+class ResponseSchema:
+    """Where an endpoint's records live, which fields they keep and which field they require"""
+    __slots__ = ("name", "url", "label", "plural", "many", "envelope_keys", "field_names", "defaults", "required")
+
+    def __init__(self, name, url, label, plural, fields=None, envelope_keys=(), required="id", many=True):
+        self.name = name
+        self.url = url
+        self.label = label
+        self.plural = plural
+        self.many = many
+        self.envelope_keys = tuple(envelope_keys)
+        # (field, default) pairs; None keeps single-object responses whole
+        self.field_names = tuple(field for field, _ in fields) if fields else None
+        self.defaults = tuple(default for _, default in fields) if fields else None
+        self.required = required
+
+    @property
+    def endpoint(self):
+        """Endpoint name used in the error log"""
+        return self.url.split("://", 1)[-1]
+
+    def project(self, item):
+        """Return the compact record for one raw item, or None if it is malformed"""
+        if type(item) is not dict or not item.get(self.required):
+            return None
+        if self.field_names is None:
+            return item
+        return tuple(map(item.get, self.field_names, self.defaults))
+
+    def project_all(self, items):
+        """Project a list of raw items, returning (records, malformed count)"""
+        if self.field_names is None:
+            records = [item for item in items if type(item) is dict and item.get(self.required)]
+            return records, len(items) - len(records)
+        required, field_names, defaults = self.required, self.field_names, self.defaults
+        records = [
+            tuple(map(item.get, field_names, defaults))
+            for item in items
+            if type(item) is dict and item.get(required)
+        ]
+        return records, len(items) - len(records)
+
+    def as_dict(self, record):
+        """Expand a compact record for display"""
+        if self.field_names is None or isinstance(record, dict):
+            return record
+        return dict(zip(self.field_names, record))
+
+RESPONSE_SCHEMAS = {
+    "actor": ResponseSchema(
+        "actor", "https://avatar.pipio.ai/actor", "Avatar", "avatars",
+        fields=(("id", None), ("name", None), ("previewImageUrl", None), ("description", None)),
+        envelope_keys=("actors", "data", "results"),
+    ),
+    "voice": ResponseSchema(
+        "voice", "https://avatar.pipio.ai/voice", "Voice", "voices",
+        fields=(("id", None), ("name", "Unknown"), ("gender", "Not specified"),
+                ("language", "Not specified"), ("accent", "Not specified")),
+        envelope_keys=("voices", "data", "results"),
+    ),
+    "single-clip": ResponseSchema(
+        "single-clip", "https://generate.pipio.ai/single-clip", "Generation", "generations", many=False,
+    ),
+    "single-clip-status": ResponseSchema(
+        "single-clip-status", "https://generate.pipio.ai/single-clip/{video_id}", "Video Status", "statuses",
+        required="status", many=False,
+    ),
+}
+
+class NormalizedResponse:
+    """Records extracted from a response, plus how they were found"""
+    __slots__ = ("records", "envelope", "keys", "top_type", "malformed")
+
+    def __init__(self, records, envelope, keys, top_type, malformed=0):
+        self.records = records
+        self.envelope = envelope
+        self.keys = keys
+        self.top_type = top_type
+        self.malformed = malformed
+
+# Function to shape an already-decoded response according to its schema
+def normalize_payload(schema, payload):
+    top_type = type(payload).__name__
+    if not schema.many:
+        if type(payload) is not dict:
+            return NormalizedResponse(None, None, None, top_type)
+        record = schema.project(payload)
+        return NormalizedResponse([record] if record is not None else [], "object", list(payload), top_type,
+                                  0 if record is not None else 1)
+    
+    if type(payload) is list:
+        records, malformed = schema.project_all(payload)
+        return NormalizedResponse(records, "list", None, top_type, malformed)
+    if type(payload) is dict:
+        for key in schema.envelope_keys:
+            items = payload.get(key)
+            if type(items) is list:
+                records, malformed = schema.project_all(items)
+                return NormalizedResponse(records, key, list(payload), top_type, malformed)
+        return NormalizedResponse(None, None, list(payload), top_type)
+    return NormalizedResponse(None, None, None, top_type)
+
+# Function to compare the normalizer with the previous hand-written envelope handling
+def benchmark_normalizer(record_count, repeat=5):
+    """Return best-of-repeat timings (ms) for turning a voice catalog body of record_count records into records.
+    
+    The first two rows cover the whole fetch path (decode + shape), before and after the normalizer;
+    the last row times normalize_payload alone on an already-decoded payload, as used for
+    generation/status responses and the API testers.
+    """
+    schema = RESPONSE_SCHEMAS["voice"]
+    items = [
+        {"id": f"voice-{i:06d}", "name": f"Voice {i}", "gender": ("Male", "Female")[i % 2],
+         "language": "English", "accent": "American", "previewAudioUrl": f"https://cdn.pipio.ai/voices/{i}.mp3",
+         "tags": ["narration"], "sampleRate": 44100}
+        # Roughly one record in a hundred is malformed
+        if i % 100 else {"name": f"Broken {i}"}
+        for i in range(record_count)
+    ]
+    payload = {"total": record_count, "voices": items}
+    body = json_dumps(payload)
+    
+    def previous_handling():
+        # Full-body decode, then the isinstance chain plus per-record safe_get projection this normalizer replaced
+        raw = json_loads(body)
+        if isinstance(raw, list):
+            voice_list = raw
+        elif isinstance(raw, dict):
+            if 'voices' in raw:
+                voice_list = raw['voices']
+            elif 'data' in raw:
+                voice_list = raw['data']
+            elif 'results' in raw:
+                voice_list = raw['results']
+            else:
+                voice_list = []
+        records = []
+        for voice in voice_list:
+            if isinstance(voice, dict):
+                voice_id = safe_get(voice, "id")
+                if voice_id:
+                    records.append({
+                        "id": voice_id,
+                        "name": safe_get(voice, "name", "Unknown"),
+                        "gender": safe_get(voice, "gender", "Not specified"),
+                        "language": safe_get(voice, "language", "Not specified"),
+                        "accent": safe_get(voice, "accent", "Not specified"),
+                    })
+        return records
+    
+    results = []
+    def streamed_handling():
+        # What fetch_catalog does with the response body
+        chunks = (body[start:start + STREAM_CHUNK_SIZE] for start in range(0, len(body), STREAM_CHUNK_SIZE))
+        return parse_catalog_stream(chunks, schema)
+    
+    for implementation, run in (("Fetch path before: json_loads + isinstance chain + safe_get", previous_handling),
+                                ("Fetch path now: parse_catalog_stream + schema projection", streamed_handling),
+                                ("normalize_payload only (body already decoded)", lambda: normalize_payload(schema, payload))):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+        results.append({"Implementation": implementation, "Records": record_count, "Best (ms)": round(best * 1000, 2)})
+    return results
+
+STREAM_CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+class JsonStream:
+    """Pull-based reader that decodes JSON values from a chunked byte stream"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        # Drop consumed text so the buffer stays around one chunk in size
+        if self.pos > STREAM_CHUNK_SIZE:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.buffer += self._text_decoder.decode(chunk)
+                return
+        self.buffer += self._text_decoder.decode(b"", final=True)
+        self.eof = True
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at the end of the stream)"""
+        while True:
+            self.pos = JSON_WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                return ""
+            self._fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self.buffer, self.pos)
+                # A value ending exactly at the buffer end (e.g. a number) may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+# Function to read a JSON array of records, projecting each record as it is decoded
+def read_projected_array(stream, schema):
+    """Return (records, malformed count) for the array at the stream position"""
+    stream.expect("[")
+    records = []
+    malformed = 0
+    if stream.peek() == "]":
+        stream.pos += 1
+        return records, malformed
+    while True:
+        record = schema.project(stream.value())
+        if record is None:
+            malformed += 1
+        else:
+            records.append(record)
+        if stream.peek() == ",":
+            stream.pos += 1
+            continue
+        stream.expect("]")
+        return records, malformed
+
+# Function to normalize a catalog response in one streaming pass
+def parse_catalog_stream(chunks, schema):
+    """Like normalize_payload, but decodes the body incrementally (earlier envelope keys win)"""
+    stream = JsonStream(chunks)
+    first = stream.peek()
+    if first == "[":
+        records, malformed = read_projected_array(stream, schema)
+        return NormalizedResponse(records, "list", None, "list", malformed)
+    if first != "{":
+        return NormalizedResponse(None, None, None, type(stream.value()).__name__)
+    
+    stream.expect("{")
+    keys = []
+    found = {}
+    if stream.peek() == "}":
+        stream.pos += 1
+    else:
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            keys.append(key)
+            if key in schema.envelope_keys and stream.peek() == "[":
+                found[key] = read_projected_array(stream, schema)
+            else:
+                stream.value()
+            if stream.peek() == ",":
+                stream.pos += 1
+                continue
+            stream.expect("}")
+            break
+    
+    for key in schema.envelope_keys:
+        if key in found:
+            records, malformed = found[key]
+            return NormalizedResponse(records, key, keys, "dict", malformed)
+    return NormalizedResponse(None, None, keys, "dict")
+
+# Function to fetch a catalog from the API
+def fetch_catalog(name, api_key, budget=None, validators=None):
+    """Fetch a catalog as (records, validators), NOT_MODIFIED, or None on failure"""
+    schema = RESPONSE_SCHEMAS[name]
     try:
-        response = requests.get(
-            "https://avatar.pipio.ai/actor",
-            headers={"Authorization": f"Key {api_key}", "Accept": "application/json"},
-            timeout=10  # Add timeout to prevent hanging
+        request_headers = {"Authorization": f"Key {api_key}", "Accept": "application/json"}
+        request_headers.update(conditional_headers(validators))
+        response = client.get(
+            schema.url,
+            headers=request_headers,
+            timeout=10,  # Add timeout to prevent hanging
+            policy=RETRY_POLICIES["catalog"],
+            budget=budget,
+            stream=True  # Parsed incrementally so the raw payload is never held in memory
         )
-        response.raise_for_status()
-        
-        # Get raw response
-        raw_response = response.json()
+        with closing(response):
+            if response.status_code == 304:
+                return NOT_MODIFIED
+            response.raise_for_status()
+            validators = response_validators(response)
+            
+            # Stream the body, keeping only the fields the UI uses
+            normalized = parse_catalog_stream(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), schema)
         
-        # Debug output for the raw API response
-        if show_debug:
-            st.write("Raw Avatar API Response:", raw_response)
-            st.write("Avatar Response Type:", type(raw_response))
-            if isinstance(raw_response, dict):
-                st.write("Avatar Response Keys:", list(raw_response.keys()))
+        # Debug output for the normalized API response
+        if show_debug and in_script_run():
+            st.write(f"{schema.label} API Response Shape:", normalized.top_type)
+            st.write(f"{schema.label} Response Envelope:", normalized.envelope)
+            if normalized.keys is not None:
+                st.write(f"{schema.label} Response Keys:", normalized.keys)
+            if normalized.records:
+                st.write(f"First {schema.label} Record:", schema.as_dict(normalized.records[0]))
+            st.write(f"Malformed {schema.label} Records:", normalized.malformed)
         
-        # According to Pipio AI documentation, the response should be a list of actors
-        # If it's already a list, use it directly
-        if isinstance(raw_response, list):
-            return raw_response
+        if normalized.records is not None:
+            return normalized.records, validators
         
-        # If it's a dictionary, look for the 'actors' key (based on documentation)
-        if isinstance(raw_response, dict):
-            # Check for common keys based on API documentation
-            if 'actors' in raw_response:
-                return raw_response['actors']
-            elif 'data' in raw_response:
-                return raw_response['data']
-            elif 'results' in raw_response:
-                return raw_response['results']
-            # If we can't find a specific key, log the error and return empty or mock data
-            else:
-                error_msg = "Could not find actors in API response. Response keys: " + str(list(raw_response.keys()))
-                log_api_error("avatar.pipio.ai/actor", "MissingDataKey", error_msg, raw_response)
-                if use_mock_data:
-                    return get_mock_avatars()
-                return []
+        # If we can't find a specific key, log the error and report the failure
+        if normalized.top_type == "dict":
+            error_msg = f"Could not find {schema.plural} in API response. Response keys: " + str(normalized.keys)
+            log_api_error(schema.endpoint, "MissingDataKey", error_msg, normalized.keys)
+            return None
         
-        # If response is neither a list nor a dictionary, log error and return empty or mock data
-        error_msg = f"Unexpected response format: {type(raw_response)}"
-        log_api_error("avatar.pipio.ai/actor", "InvalidResponseFormat", error_msg, str(raw_response)[:500])
-        if use_mock_data:
-            return get_mock_avatars()
-        return []
+        # If response is neither a list nor a dictionary, log error and report the failure
+        error_msg = f"Unexpected response format: {normalized.top_type}"
+        log_api_error(schema.endpoint, "InvalidResponseFormat", error_msg)
+        return None
         
     except requests.exceptions.RequestException as e:
-        error_msg = f"Error fetching avatars: {str(e)}"
+        error_msg = f"Error fetching {schema.plural}: {str(e)}"
         response_text = None
         if hasattr(e, 'response') and e.response:
             try:
@@ -251,98 +990,622 @@ def get_avatars(api_key):
                 error_msg += f" (Status: {e.response.status_code})"
             except:
                 pass
-        log_api_error("avatar.pipio.ai/actor", "RequestException", error_msg, response_text)
-        if use_mock_data:
-            return get_mock_avatars()
-        return []
+        log_api_error(schema.endpoint, "RequestException", error_msg, response_text)
+        return None
     except json.JSONDecodeError as e:
-        error_msg = f"Error decoding avatar JSON: {str(e)}"
-        log_api_error("avatar.pipio.ai/actor", "JSONDecodeError", error_msg, response.text[:500])
-        if use_mock_data:
-            return get_mock_avatars()
-        return []
+        error_msg = f"Error decoding {schema.label.lower()} JSON: {str(e)}"
+        log_api_error(schema.endpoint, "JSONDecodeError", error_msg, e.doc[max(0, e.pos - 250):e.pos + 250])
+        return None
     except Exception as e:
-        error_msg = f"Unexpected error fetching avatars: {str(e)}"
-        log_api_error("avatar.pipio.ai/actor", "UnexpectedException", error_msg, traceback.format_exc())
-        if use_mock_data:
-            return get_mock_avatars()
-        return []
-
-# Function to fetch voices with caching
-@st.cache_data(ttl=600)
-def get_voices(api_key):
+        error_msg = f"Unexpected error fetching {schema.plural}: {str(e)}"
+        log_api_error(schema.endpoint, "UnexpectedException", error_msg, traceback.format_exc())
+        return None
+
+# Function to fetch avatars from the API
+def fetch_avatars(api_key, budget=None, validators=None):
+    return fetch_catalog("actor", api_key, budget, validators)
+
+# Function to fetch voices from the API
+def fetch_voices(api_key, budget=None, validators=None):
+    return fetch_catalog("voice", api_key, budget, validators)
+
+# Function to test a catalog endpoint and show how its response normalizes
+def test_catalog_endpoint(name):
+    schema = RESPONSE_SCHEMAS[name]
     try:
-        response = requests.get(
-            "https://avatar.pipio.ai/voice",
+        response = client.get(
+            schema.url,
             headers={"Authorization": f"Key {api_key}", "Accept": "application/json"},
-            timeout=10  # Add timeout to prevent hanging
+            timeout=10
         )
-        response.raise_for_status()
         
-        # Get raw response
-        raw_response = response.json()
+        st.write(f"{schema.label} API Status Code: {response.status_code}")
         
-        # Debug output for the raw API response
-        if show_debug:
-            st.write("Raw Voice API Response:", raw_response)
-            st.write("Voice Response Type:", type(raw_response))
-            if isinstance(raw_response, dict):
-                st.write("Voice Response Keys:", list(raw_response.keys()))
+        if response.status_code == 200:
+            st.success(f"{schema.label} API connection successful")
+            try:
+                normalized = normalize_payload(schema, json_loads(response.content))
+                st.write(f"Response Type: {normalized.top_type}")
+                if normalized.keys is not None:
+                    st.write(f"Keys: {normalized.keys}")
+                if normalized.records is None:
+                    st.warning(f"No {schema.plural} found (expected a list or one of: {', '.join(schema.envelope_keys)})")
+                else:
+                    st.write(f"Found {len(normalized.records)} {schema.plural} under '{normalized.envelope}' ({normalized.malformed} malformed)")
+                    st.write(f"Sample {schema.label.lower()}:", schema.as_dict(normalized.records[0]) if normalized.records else f"No {schema.plural} found")
+            except json.JSONDecodeError:
+                st.error("Could not parse JSON response")
+                st.code(response.text[:500])
+        else:
+            st.error(f"{schema.label} API error: {response.status_code}")
+            st.code(response.text[:500])
+    except Exception as e:
+        st.error(f"{schema.label} API test failed: {str(e)}")
+
+# Directory for on-disk caches (catalogs, thumbnails, videos)
+CACHE_DIR = os.environ.get("PIPIO_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".pipio_cache"))
+
+# Typed, display-ready catalog records
+class AvatarRecord:
+    """An avatar (actor) with the fields the UI displays"""
+    __slots__ = ("id", "name", "preview_image_url", "description")
+
+    def __init__(self, id, name, preview_image_url=None, description=None):
+        self.id = id
+        self.name = name if name is not None else f"Unknown-{id}"
+        self.preview_image_url = preview_image_url
+        self.description = description
+
+class VoiceRecord:
+    """A voice with the fields the UI displays and its precomputed display name"""
+    __slots__ = ("id", "name", "gender", "language", "accent", "display_name")
+
+    def __init__(self, id, name, gender, language, accent):
+        self.id = id
+        self.name = name
+        self.gender = gender
+        self.language = language
+        self.accent = accent
+        self.display_name = f"{name} ({gender}, {language})"
+
+
+# Searchable fields per catalog name, with the weight of a match in each field
+SEARCH_FIELDS = {
+    "actor": (("name", 3), ("description", 1)),
+    "voice": (("name", 3), ("gender", 1), ("language", 1), ("accent", 1)),
+}
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+")
+
+class SearchIndex:
+    """Case-folded n-gram index answering substring queries over a catalog's text fields"""
+
+    def __init__(self, records, fields):
+        self.ids = [record.id for record in records]
+        self._texts = []
+        # grams[n] maps every n-gram (n = 1..3) to the records containing it
+        self._grams = {1: {}, 2: {}, 3: {}}
+        for position, record in enumerate(records):
+            texts = []
+            for field, weight in fields:
+                value = getattr(record, field)
+                if not value:
+                    continue
+                text = str(value).casefold()
+                texts.append((text, weight, {match.start() for match in SEARCH_TOKEN_PATTERN.finditer(text)}))
+                for n, grams in self._grams.items():
+                    for start in range(len(text) - n + 1):
+                        grams.setdefault(text[start:start + n], set()).add(position)
+            self._texts.append(texts)
+
+    def _candidates(self, query):
+        n = min(3, len(query))
+        grams = self._grams[n]
+        postings = []
+        for start in range(len(query) - n + 1):
+            posting = grams.get(query[start:start + n])
+            if posting is None:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def search(self, query):
+        """Return matching record ids, best matches first (all ids for an empty query)"""
+        query = query.casefold().strip()
+        if not query:
+            return list(self.ids)
         
-        # According to Pipio AI documentation, the response should be a list of voices
-        # If it's already a list, use it directly
-        if isinstance(raw_response, list):
-            return raw_response
+        ranked = []
+        for position in self._candidates(query):
+            best = 0
+            for text, weight, token_starts in self._texts[position]:
+                found = text.find(query)
+                if found < 0:
+                    continue
+                # Exact field match beats a match at a word start, which beats any substring
+                if text == query:
+                    score = weight * 4
+                elif found in token_starts:
+                    score = weight * 2
+                else:
+                    score = weight
+                best = max(best, score)
+            if best:
+                ranked.append((-best, position))
+        ranked.sort()
+        return [self.ids[position] for _, position in ranked]
+
+# Columns of the voice table, and the ones stored as categoricals
+VOICE_TABLE_COLUMNS = ["Name", "Gender", "Language", "Accent", "ID"]
+VOICE_FACET_COLUMNS = ["Gender", "Language", "Accent"]
+# Number of distinct filter combinations remembered per voice catalog
+VOICE_FILTER_CACHE_SIZE = 64
+
+# Function to build the voice table once per catalog version
+def build_voice_frame(records):
+    frame = pd.DataFrame({
+        "Name": [record.name for record in records],
+        "Gender": [record.gender for record in records],
+        "Language": [record.language for record in records],
+        "Accent": [record.accent for record in records],
+        "ID": [record.id for record in records],
+        "Display": [record.display_name for record in records],
+    })
+    for column in VOICE_FACET_COLUMNS:
+        frame[column] = frame[column].astype("category")
+    return frame
+
+# Record type used for each catalog name
+CATALOG_RECORD_TYPES = {
+    "actor": AvatarRecord,
+    "voice": VoiceRecord,
+}
+
+class Catalog:
+    """Indexed view of one catalog version, built once and shared by every rerun"""
+    __slots__ = ("name", "version", "items", "records", "by_id", "name_to_id", "display_to_id", "search_index",
+                 "frame", "facets", "_filter_cache", "_filter_lock")
+
+    def __init__(self, name, items, version=0):
+        record_type = CATALOG_RECORD_TYPES[name]
+        schema = RESPONSE_SCHEMAS[name]
+        by_id = {}
+        name_to_id = {}
+        for item in items:
+            # Rows are schema-ordered tuples (JSON lists on disk); mock data and older cache entries are dicts
+            row = schema.project(item) if isinstance(item, dict) else item
+            if not row:
+                continue
+            record = record_type(*row)
+            by_id[record.id] = record
+            name_to_id[record.name] = record.id
         
-        # If it's a dictionary, look for the 'voices' key (based on documentation)
-        if isinstance(raw_response, dict):
-            # Check for common keys based on API documentation
-            if 'voices' in raw_response:
-                return raw_response['voices']
-            elif 'data' in raw_response:
-                return raw_response['data']
-            elif 'results' in raw_response:
-                return raw_response['results']
-            # If we can't find a specific key, log the error and return empty or mock data
+        self.name = name
+        self.version = version
+        self.items = items
+        self.records = tuple(by_id.values())
+        self.by_id = by_id
+        self.name_to_id = name_to_id
+        # Voices are selected by display name and shown as a filterable table
+        if name == "voice":
+            self.display_to_id = {record.display_name: record.id for record in self.records}
+            self.frame = build_voice_frame(self.records)
+            self.facets = {column: self.frame[column].unique().tolist() for column in VOICE_FACET_COLUMNS}
+        else:
+            self.display_to_id = dict(name_to_id)
+            self.frame = None
+            self.facets = {}
+        self.search_index = SearchIndex(self.records, SEARCH_FIELDS[name])
+        self._filter_cache = OrderedDict()
+        self._filter_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, record_id, default=None):
+        return self.by_id.get(record_id, default)
+
+    def filter_voices(self, genders=(), languages=(), accents=(), search=""):
+        """Return (table, display name -> id) for a filter combination, memoized per catalog"""
+        key = (tuple(sorted(genders)), tuple(sorted(languages)), tuple(sorted(accents)), search.casefold().strip())
+        with self._filter_lock:
+            cached = self._filter_cache.get(key)
+            if cached is not None:
+                self._filter_cache.move_to_end(key)
+                return cached
+        
+        frame = self.frame
+        mask = pd.Series(True, index=frame.index)
+        for column, selected in zip(VOICE_FACET_COLUMNS, key[:3]):
+            if selected:
+                mask &= frame[column].isin(selected)
+        filtered = frame[mask]
+        
+        if key[3]:
+            search_rank = {voice_id: rank for rank, voice_id in enumerate(self.search_index.search(key[3]))}
+            filtered = filtered[filtered["ID"].isin(search_rank)]
+            filtered = filtered.iloc[filtered["ID"].map(search_rank).argsort()]
+        
+        result = (filtered[VOICE_TABLE_COLUMNS], dict(zip(filtered["Display"].tolist(), filtered["ID"].tolist())))
+        with self._filter_lock:
+            self._filter_cache[key] = result
+            if len(self._filter_cache) > VOICE_FILTER_CACHE_SIZE:
+                self._filter_cache.popitem(last=False)
+        return result
+
+# In-memory catalog cache whose TTL follows the "Cache TTL" setting
+class CatalogCache:
+    """Process-wide catalog cache keyed by catalog name and API key hash"""
+
+    def __init__(self):
+        self._entries = {}
+        self._revalidating = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._version = 0
+
+    def lookup(self, name, key_hash, ttl):
+        """Return (entry, is_fresh) for a cached catalog, or (None, False) on a miss"""
+        with self._lock:
+            entry = self._entries.get((name, key_hash))
+            if entry is None:
+                self.misses += 1
+                return None, False
+            fresh = time.time() - entry["fetched_at"] < ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry, fresh
+
+    def put(self, name, key_hash, items, fetched_at=None, validators=None):
+        entry = {
+            "items": items,
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+            "validators": validators or {},
+            "catalog": None,
+        }
+        with self._lock:
+            self._version += 1
+            entry["version"] = self._version
+            self._entries[(name, key_hash)] = entry
+        return entry
+
+    def peek(self, name, key_hash):
+        """Return an entry without counting it as a lookup"""
+        with self._lock:
+            return self._entries.get((name, key_hash))
+
+    def touch(self, name, key_hash):
+        """Mark an entry as fresh again after a 304 Not Modified"""
+        with self._lock:
+            entry = self._entries.get((name, key_hash))
+            if entry is not None:
+                entry["fetched_at"] = time.time()
+                self.not_modified += 1
+            return entry
+
+    def begin_revalidate(self, name, key_hash):
+        """Claim the background revalidation of an entry; False if one is already running"""
+        with self._lock:
+            if (name, key_hash) in self._revalidating:
+                return False
+            self._revalidating.add((name, key_hash))
+            return True
+
+    def end_revalidate(self, name, key_hash):
+        with self._lock:
+            self._revalidating.discard((name, key_hash))
+
+    def invalidate(self, key_hash=None):
+        """Drop the entries for one API key hash, or every entry if none is given"""
+        with self._lock:
+            for entry_key in list(self._entries):
+                if key_hash is None or entry_key[1] == key_hash:
+                    del self._entries[entry_key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+                "revalidating": len(self._revalidating),
+            }
+
+# Disk-backed copy of the last good catalog, so restarts can serve it immediately
+class CatalogStore:
+    """SQLite store holding the last successfully fetched catalog per API key hash"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS catalogs ("
+                "name TEXT NOT NULL, key_hash TEXT NOT NULL, fetched_at REAL NOT NULL, items TEXT NOT NULL, "
+                "validators TEXT, PRIMARY KEY (name, key_hash))"
+            )
+            # Stores created before validators were kept lack the column
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(catalogs)")]
+            if "validators" not in columns:
+                conn.execute("ALTER TABLE catalogs ADD COLUMN validators TEXT")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def load(self, name, key_hash):
+        """Return (items, fetched_at, validators) for a stored catalog, or None"""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT items, fetched_at, validators FROM catalogs WHERE name = ? AND key_hash = ?",
+                    (name, key_hash)
+                ).fetchone()
+            if row is None:
+                return None
+            return json_loads(row[0]), row[1], json_loads(row[2]) if row[2] else {}
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def save(self, name, key_hash, items, fetched_at, validators=None):
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO catalogs (name, key_hash, fetched_at, items, validators) VALUES (?, ?, ?, ?, ?)",
+                    (name, key_hash, fetched_at, json_dumps(items), json_dumps(validators or {}))
+                )
+        except sqlite3.Error:
+            # The disk copy is only an optimization; the in-memory cache still works
+            pass
+
+    def touch(self, name, key_hash, fetched_at):
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "UPDATE catalogs SET fetched_at = ? WHERE name = ? AND key_hash = ?",
+                    (fetched_at, name, key_hash)
+                )
+        except sqlite3.Error:
+            pass
+
+    def delete(self, key_hash=None):
+        try:
+            with closing(self._connect()) as conn, conn:
+                if key_hash is None:
+                    conn.execute("DELETE FROM catalogs")
+                else:
+                    conn.execute("DELETE FROM catalogs WHERE key_hash = ?", (key_hash,))
+        except sqlite3.Error:
+            pass
+
+# Coalesces concurrent identical requests into one in-flight call
+class SingleFlight:
+    """Lets the first caller for a key do the work while concurrent callers wait for its result"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+                leader = True
+                self.executed += 1
             else:
-                error_msg = "Could not find voices in API response. Response keys: " + str(list(raw_response.keys()))
-                log_api_error("avatar.pipio.ai/voice", "MissingDataKey", error_msg, raw_response)
-                if use_mock_data:
-                    return get_mock_voices()
-                return []
+                leader = False
+                self.coalesced += 1
         
-        # If response is neither a list nor a dictionary, log error and return empty or mock data
-        error_msg = f"Unexpected response format: {type(raw_response)}"
-        log_api_error("avatar.pipio.ai/voice", "InvalidResponseFormat", error_msg, str(raw_response)[:500])
-        if use_mock_data:
-            return get_mock_voices()
-        return []
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
         
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Error fetching voices: {str(e)}"
-        response_text = None
-        if hasattr(e, 'response') and e.response:
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+@st.cache_resource
+def get_catalog_flights():
+    """Create the shared single-flight group for catalog fetches once per process"""
+    return SingleFlight()
+
+@st.cache_resource
+def get_catalog_cache():
+    """Create the shared catalog cache once per process"""
+    return CatalogCache()
+
+@st.cache_resource
+def get_catalog_store():
+    """Open the on-disk catalog store once per process"""
+    return CatalogStore(os.path.join(CACHE_DIR, "catalogs.sqlite3"))
+
+@st.cache_resource
+def get_background_executor():
+    """Thread pool for background work that must never block a rerun"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="pipio-background")
+
+catalog_cache = get_catalog_cache()
+catalog_store = get_catalog_store()
+catalog_flights = get_catalog_flights()
+
+# Function to get the indexed catalog of a cache entry, building it once per version
+def catalog_for(name, entry):
+    catalog = entry["catalog"]
+    if catalog is None:
+        catalog = Catalog(name, entry["items"], entry["version"])
+        entry["catalog"] = catalog
+    return catalog
+
+# Function to store a fetch result in memory and on disk
+def store_catalog(name, key_hash, result):
+    """Apply a fetcher result to the caches and return the entry (None if the fetch failed)"""
+    if result is None:
+        return None
+    if result == NOT_MODIFIED:
+        entry = catalog_cache.touch(name, key_hash)
+        if entry is not None:
+            catalog_store.touch(name, key_hash, entry["fetched_at"])
+        return entry
+    items, validators = result
+    entry = catalog_cache.put(name, key_hash, items, validators=validators)
+    # Index now, on whichever thread fetched, so reruns only ever read it
+    catalog_for(name, entry)
+    catalog_store.save(name, key_hash, items, entry["fetched_at"], validators)
+    return entry
+
+# Function to refetch a stale catalog without blocking the caller
+def revalidate_catalog(name, api_key, fetcher, validators):
+    key_hash = hash_api_key(api_key)
+    try:
+        store_catalog(name, key_hash, fetcher(api_key, validators=validators))
+    finally:
+        catalog_cache.end_revalidate(name, key_hash)
+
+# Function to load an indexed catalog through the cache, falling back to mock data on failure
+def load_catalog(name, api_key, fetcher, mock_factory):
+    key_hash = hash_api_key(api_key)
+    entry, fresh = catalog_cache.lookup(name, key_hash, cache_ttl * 60)
+    if entry is None:
+        # After a restart the last good catalog is still on disk
+        stored = catalog_store.load(name, key_hash)
+        if stored is not None:
+            items, fetched_at, validators = stored
+            entry = catalog_cache.put(name, key_hash, items, fetched_at, validators)
+            catalog_for(name, entry)
+            fresh = time.time() - fetched_at < cache_ttl * 60
+    
+    if entry is not None:
+        # Stale-while-revalidate: serve what we have and refresh in the background
+        if not fresh and catalog_cache.begin_revalidate(name, key_hash):
+            get_background_executor().submit(revalidate_catalog, name, api_key, fetcher, entry["validators"])
+        return catalog_for(name, entry)
+    
+    def fetch_once():
+        # A flight that finished just before this one started already filled the cache
+        latest = catalog_cache.peek(name, key_hash)
+        if latest is not None:
+            return latest
+        return store_catalog(name, key_hash, fetcher(api_key, budget=retry_budget))
+    
+    # Concurrent cold misses for the same catalog and key share a single HTTP call
+    entry = catalog_flights.do((name, key_hash), fetch_once)
+    if entry is None:
+        # Failed fetches are not cached so the next rerun tries the API again
+        return Catalog(name, mock_factory() if use_mock_data else [])
+    
+    return catalog_for(name, entry)
+
+# Function to get avatars (cached per API key)
+def get_avatars(api_key):
+    return load_catalog("actor", api_key, fetch_avatars, get_mock_avatars)
+
+# Function to get voices (cached per API key)
+def get_voices(api_key):
+    return load_catalog("voice", api_key, fetch_voices, get_mock_voices)
+
+# Catalog fetchers kept warm by the background refresher, keyed by catalog name
+CATALOG_FETCHERS = {
+    "actor": fetch_avatars,
+    "voice": fetch_voices,
+}
+# How often the refresher wakes up, and how early before expiry it refreshes
+CATALOG_REFRESH_INTERVAL = 15.0
+CATALOG_REFRESH_LEAD = 0.1
+# API keys not seen for this long are no longer refreshed
+ACTIVE_KEY_WINDOW = 30 * 60
+
+class CatalogRefresher:
+    """Daemon thread that re-fetches catalogs for active API keys shortly before they expire"""
+
+    def __init__(self, cache, revalidate, interval=CATALOG_REFRESH_INTERVAL):
+        self.cache = cache
+        self.revalidate = revalidate
+        self.interval = interval
+        # Raw keys are needed to call the API; they are only held in memory
+        self._active = {}
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self._thread = threading.Thread(target=self._run, name="pipio-catalog-refresher", daemon=True)
+        self._thread.start()
+
+    def register(self, api_key, ttl, fetchers):
+        """Mark an API key as active, remembering the TTL and fetchers it uses.
+        
+        Fetchers are re-registered on every rerun, so background refreshes use the latest rerun's
+        client and settings rather than those of the rerun that started this thread.
+        """
+        with self._lock:
+            self._active[hash_api_key(api_key)] = {
+                "api_key": api_key,
+                "ttl": ttl,
+                "fetchers": dict(fetchers),
+                "last_seen": time.time(),
+            }
+
+    def active_keys(self):
+        with self._lock:
+            return len(self._active)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
             try:
-                response_text = e.response.text
-                error_msg += f" (Status: {e.response.status_code})"
-            except:
-                pass
-        log_api_error("avatar.pipio.ai/voice", "RequestException", error_msg, response_text)
-        if use_mock_data:
-            return get_mock_voices()
-        return []
-    except json.JSONDecodeError as e:
-        error_msg = f"Error decoding voice JSON: {str(e)}"
-        log_api_error("avatar.pipio.ai/voice", "JSONDecodeError", error_msg, response.text[:500])
-        if use_mock_data:
-            return get_mock_voices()
-        return []
-    except Exception as e:
-        error_msg = f"Unexpected error fetching voices: {str(e)}"
-        log_api_error("avatar.pipio.ai/voice", "UnexpectedException", error_msg, traceback.format_exc())
-        if use_mock_data:
-            return get_mock_voices()
-        return []
+                self.refresh_due()
+            except Exception:
+                background_errors.append({
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "endpoint": "catalog-refresher",
+                    "error_type": "UnexpectedException",
+                    "error_message": traceback.format_exc(limit=3),
+                    "response_data": None,
+                })
+
+    def refresh_due(self):
+        """Refresh every catalog of every active key that is about to expire"""
+        now = time.time()
+        with self._lock:
+            for key_hash in [k for k, v in self._active.items() if now - v["last_seen"] > ACTIVE_KEY_WINDOW]:
+                del self._active[key_hash]
+            active = list(self._active.items())
+        
+        for key_hash, info in active:
+            refresh_age = info["ttl"] * (1 - CATALOG_REFRESH_LEAD)
+            for name, fetcher in info["fetchers"].items():
+                entry = self.cache.peek(name, key_hash)
+                # Cold catalogs are loaded by the first rerun that needs them
+                if entry is None or now - entry["fetched_at"] < refresh_age:
+                    continue
+                if self.cache.begin_revalidate(name, key_hash):
+                    self.revalidate(name, info["api_key"], fetcher, entry["validators"])
+                    self.refreshes += 1
+
+@st.cache_resource
+def get_catalog_refresher(_cache, _revalidate):
+    """Start the background catalog refresher once per process"""
+    return CatalogRefresher(_cache, _revalidate)
+
+catalog_refresher = get_catalog_refresher(catalog_cache, revalidate_catalog)
 
 # Function to generate video
 def generate_video(actor_id, voice_id, script, api_key, additional_params=None):
@@ -361,20 +1624,32 @@ def generate_video(actor_id, voice_id, script, api_key, additional_params=None):
         if show_debug:
             st.write("Generate Video Payload:", payload)
         
-        response = requests.post(
+        rate_limiter.acquire(api_key, "generate")
+        response = client.post(
             "https://generate.pipio.ai/single-clip",
             headers={"Authorization": f"Key {api_key}", "Content-Type": "application/json"},
-            data=json.dumps(payload),
-            timeout=30  # Longer timeout for video generation
+            data=json_dumps(payload),
+            timeout=30,  # Longer timeout for video generation
+            policy=RETRY_POLICIES["generate"],
+            budget=retry_budget
         )
         response.raise_for_status()
-        response_data = response.json()
+        response_data = json_loads(response.content)
         
         # Debug output for response
         if show_debug:
             st.write("Generate Video Response:", response_data)
         
+        # Flag responses that lack the video id rather than failing later in the UI
+        normalized = normalize_payload(RESPONSE_SCHEMAS["single-clip"], response_data)
+        if not normalized.records:
+            error_msg = f"Generation response has no video id ({normalized.top_type})"
+            log_api_error("generate.pipio.ai/single-clip", "MalformedResponse", error_msg, normalized.keys)
+        
         return response_data
+    except RateLimitExceeded as e:
+        log_api_error("generate.pipio.ai/single-clip", "RateLimited", str(e))
+        return None
     except requests.exceptions.RequestException as e:
         error_msg = f"Error generating video: {str(e)}"
         response_text = None
@@ -398,19 +1673,31 @@ def generate_video(actor_id, voice_id, script, api_key, additional_params=None):
 # Function to check video status
 def check_video_status(video_id, api_key):
     try:
-        response = requests.get(
+        rate_limiter.acquire(api_key, "status")
+        response = client.get(
             f"https://generate.pipio.ai/single-clip/{video_id}",
             headers={"Authorization": f"Key {api_key}", "Accept": "application/json"},
-            timeout=10
+            timeout=10,
+            policy=RETRY_POLICIES["status"],
+            budget=retry_budget
         )
         response.raise_for_status()
-        response_data = response.json()
+        response_data = json_loads(response.content)
         
         # Debug output for response
         if show_debug:
             st.write("Video Status Response:", response_data)
         
+        # Flag responses that lack a status rather than polling on them silently
+        normalized = normalize_payload(RESPONSE_SCHEMAS["single-clip-status"], response_data)
+        if not normalized.records:
+            error_msg = f"Status response has no status field ({normalized.top_type})"
+            log_api_error(f"generate.pipio.ai/single-clip/{video_id}", "MalformedResponse", error_msg, normalized.keys)
+        
         return response_data
+    except RateLimitExceeded as e:
+        log_api_error(f"generate.pipio.ai/single-clip/{video_id}", "RateLimited", str(e))
+        return None
     except requests.exceptions.RequestException as e:
         error_msg = f"Error checking video status: {str(e)}"
         response_text = None
@@ -431,12 +1718,127 @@ def check_video_status(video_id, api_key):
         log_api_error(f"generate.pipio.ai/single-clip/{video_id}", "UnexpectedException", error_msg, traceback.format_exc())
         return None
 
+# Directory and chunk size for videos streamed to disk
+VIDEO_DIR = os.path.join(CACHE_DIR, "videos")
+VIDEO_CHUNK_SIZE = 256 * 1024
+# Attempts made to finish one download, each resuming from the last byte written
+VIDEO_RESUME_ATTEMPTS = 5
+# Minimum seconds between progress reports
+VIDEO_PROGRESS_INTERVAL = 0.25
+
+class IncompleteDownload(requests.exceptions.RequestException):
+    """Raised when a video stream ends before Content-Length bytes arrived"""
+
+# Function to parse a Content-Range header into (first byte, total size or None)
+def parse_content_range(value):
+    match = re.match(r"bytes\s+(\d+)-\d+/(\d+|\*)", value or "")
+    if not match:
+        return None, None
+    total = match.group(2)
+    return int(match.group(1)), int(total) if total != "*" else None
+
+# Function to read the validator saved next to a partial download
+def read_partial_validator(path):
+    try:
+        with open(path) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
 # Function to download video
-def download_video(url):
+def download_video(url, destination, progress=None, budget=None, segments=1, http=None):
+    """Stream the video at url into destination, resuming interrupted transfers with Range requests.
+    
+    progress, if given, is called as progress(bytes_done, total_bytes_or_None). With segments > 1,
+    large videos are fetched as that many parallel byte ranges. Callers running outside the
+    current rerun (such as the video store) pass its client as http. Returns the path or None.
+    """
+    http = http if http is not None else client
+    partial_path = destination + ".part"
+    validator_path = partial_path + ".validator"
+    policy = RETRY_POLICIES["download"]
     try:
-        response = requests.get(url, timeout=30)  # Longer timeout for video download
-        response.raise_for_status()
-        return response.content
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        # A single-stream partial download is cheaper to resume than to re-fetch in segments
+        if segments > 1 and not os.path.exists(partial_path):
+            try:
+                if download_video_segmented(url, destination, segments, progress, budget, http):
+                    return destination
+            except RangeNotSupported:
+                pass
+        
+        for attempt in range(VIDEO_RESUME_ATTEMPTS):
+            offset = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+            headers = {}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+                # Only resume if the video is unchanged since the partial download
+                validator = read_partial_validator(validator_path)
+                if validator:
+                    headers["If-Range"] = validator
+            
+            try:
+                response = http.get(url, headers=headers, timeout=30, policy=policy, budget=budget, stream=True)  # Longer timeout for video download
+                with closing(response):
+                    if response.status_code == 416:
+                        # The partial file no longer lines up with the video; start over
+                        os.remove(partial_path)
+                        continue
+                    response.raise_for_status()
+                    
+                    if response.status_code == 206:
+                        # total comes from Content-Range: the whole video, not the length of this range
+                        first_byte, total = parse_content_range(response.headers.get("Content-Range"))
+                        if first_byte != offset:
+                            # A range we did not ask for; drop the partial file and retry without Range
+                            for path in (partial_path, validator_path):
+                                if os.path.exists(path):
+                                    os.remove(path)
+                            continue
+                        mode = "ab"
+                    else:
+                        # Full body: the server ignored Range or the video changed
+                        offset = 0
+                        mode = "wb"
+                        length = response.headers.get("Content-Length")
+                        total = int(length) if length and not response.headers.get("Content-Encoding") else None
+                        validator = response.headers.get("ETag", "")
+                        if not validator or validator.startswith("W/"):
+                            validator = response.headers.get("Last-Modified", "")
+                        with open(validator_path, "w") as f:
+                            f.write(validator)
+                    
+                    done = offset
+                    reported_at = 0.0
+                    with open(partial_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=VIDEO_CHUNK_SIZE):
+                            f.write(chunk)
+                            done += len(chunk)
+                            if progress is not None and time.time() - reported_at >= VIDEO_PROGRESS_INTERVAL:
+                                progress(done, total)
+                                reported_at = time.time()
+                
+                # Verify the body against Content-Length before trusting it
+                if total is not None and done != total:
+                    raise IncompleteDownload(f"Received {done} of {total} bytes")
+                
+                # Readers only ever see complete files
+                os.replace(partial_path, destination)
+                if os.path.exists(validator_path):
+                    os.remove(validator_path)
+                if progress is not None:
+                    progress(done, total if total is not None else done)
+                return destination
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError, IncompleteDownload):
+                # Keep the partial file and resume from its end after a backoff
+                if attempt + 1 == VIDEO_RESUME_ATTEMPTS:
+                    raise
+                delay = policy.backoff(attempt)
+                if budget is not None and not budget.spend(delay):
+                    raise
+                time.sleep(delay)
+        raise IncompleteDownload(f"Gave up after {VIDEO_RESUME_ATTEMPTS} attempts")
     except requests.exceptions.RequestException as e:
         error_msg = f"Error downloading video: {str(e)}"
         log_api_error(url, "RequestException", error_msg)
@@ -446,6 +1848,555 @@ def download_video(url):
         log_api_error(url, "UnexpectedException", error_msg, traceback.format_exc())
         return None
 
+# Large videos can be fetched as several byte ranges in parallel
+VIDEO_SEGMENT_MIN_BYTES = 8 * 1024 * 1024
+VIDEO_MAX_SEGMENTS = 8
+
+class RangeNotSupported(requests.exceptions.RequestException):
+    """Raised when the server will not serve the byte ranges a segmented download needs"""
+
+@st.cache_resource
+def get_download_executor():
+    """Process-wide thread pool for the byte-range workers of segmented downloads"""
+    return ThreadPoolExecutor(max_workers=VIDEO_MAX_SEGMENTS * 2, thread_name_prefix="pipio-download")
+
+# Function to fetch one byte range of a video into its place in a preallocated file
+def download_segment(url, path, start, end, validator, advance, stop, http, budget=None):
+    """Write bytes start..end (inclusive) of url at the same offset in path, resuming within the segment"""
+    policy = RETRY_POLICIES["download"]
+    position = start
+    for attempt in range(VIDEO_RESUME_ATTEMPTS):
+        headers = {"Range": f"bytes={position}-{end}"}
+        if validator:
+            headers["If-Range"] = validator
+        try:
+            response = http.get(url, headers=headers, timeout=30, policy=policy, budget=budget, stream=True)
+            with closing(response):
+                response.raise_for_status()
+                first_byte, _ = parse_content_range(response.headers.get("Content-Range"))
+                if response.status_code != 206 or first_byte != position:
+                    raise RangeNotSupported(f"Asked for bytes {position}-{end}, got status {response.status_code}")
+                with open(path, "r+b") as f:
+                    f.seek(position)
+                    for chunk in response.iter_content(chunk_size=VIDEO_CHUNK_SIZE):
+                        if stop.is_set():
+                            return
+                        chunk = chunk[:end + 1 - position]
+                        f.write(chunk)
+                        position += len(chunk)
+                        advance(len(chunk))
+            if position != end + 1:
+                raise IncompleteDownload(f"Segment {start}-{end} stopped at byte {position}")
+            return
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError, IncompleteDownload):
+            if attempt + 1 == VIDEO_RESUME_ATTEMPTS or stop.is_set():
+                raise
+            delay = policy.backoff(attempt)
+            if budget is not None and not budget.spend(delay):
+                raise
+            time.sleep(delay)
+
+# Function to download a large video as parallel byte ranges
+def download_video_segmented(url, destination, segments, progress, budget, http):
+    """Fetch url into destination with up to `segments` concurrent Range requests.
+    
+    Returns the path, or None when the video is too small to be worth splitting.
+    Raises RangeNotSupported when the server does not honour byte ranges.
+    """
+    # A one-byte range tells us the size, the validator and whether ranges work at all
+    probe = http.get(url, headers={"Range": "bytes=0-0"}, timeout=30, policy=RETRY_POLICIES["download"],
+                       budget=budget, stream=True)
+    with closing(probe):
+        probe.raise_for_status()
+        first_byte, total = parse_content_range(probe.headers.get("Content-Range"))
+        validator = probe.headers.get("ETag", "")
+        if not validator or validator.startswith("W/"):
+            validator = probe.headers.get("Last-Modified", "")
+    if probe.status_code != 206 or first_byte != 0 or total is None:
+        raise RangeNotSupported(f"Range probe returned status {probe.status_code}")
+    if total < VIDEO_SEGMENT_MIN_BYTES:
+        return None
+    
+    # Segments are written in place into a file of the final size
+    segment_path = destination + ".segments"
+    with open(segment_path, "wb") as f:
+        f.truncate(total)
+    size = -(-total // min(segments, VIDEO_MAX_SEGMENTS))
+    ranges = [(start, min(start + size, total) - 1) for start in range(0, total, size)]
+    
+    lock = threading.Lock()
+    done = [0]
+    
+    def advance(count):
+        with lock:
+            done[0] += count
+    
+    stop = threading.Event()
+    futures = [
+        get_download_executor().submit(download_segment, url, segment_path, start, end, validator, advance, stop, http, budget)
+        for start, end in ranges
+    ]
+    try:
+        pending = futures
+        while pending:
+            _, pending = wait(pending, timeout=VIDEO_PROGRESS_INTERVAL, return_when=FIRST_EXCEPTION)
+            if progress is not None:
+                progress(done[0], total)
+            for future in futures:
+                if future.done() and future.exception() is not None:
+                    raise future.exception()
+    except BaseException:
+        # Stop the remaining workers before discarding their file
+        stop.set()
+        wait(futures)
+        os.remove(segment_path)
+        raise
+    
+    # Every segment checked its own length; check the sum against the advertised size too
+    if done[0] != total:
+        os.remove(segment_path)
+        raise IncompleteDownload(f"Received {done[0]} of {total} bytes")
+    os.replace(segment_path, destination)
+    return destination
+
+# On-disk store for completed videos, shared by previews and downloads
+VIDEO_STORE_BYTES = int(os.environ.get("PIPIO_VIDEO_STORE_BYTES", 1024 * 1024 * 1024))
+VIDEO_HASH_CHUNK_SIZE = 1024 * 1024
+
+class VideoStore:
+    """Keeps each video once per content hash, with an LRU byte budget on disk"""
+
+    def __init__(self, directory, max_bytes):
+        self.objects_dir = os.path.join(directory, "objects")
+        self.refs_dir = os.path.join(directory, "refs")
+        self.incoming_dir = os.path.join(directory, "incoming")
+        for path in (self.objects_dir, self.refs_dir, self.incoming_dir):
+            os.makedirs(path, exist_ok=True)
+        # Oversized videos from a previous process are no longer referenced
+        for filename in os.listdir(self.incoming_dir):
+            if filename.endswith(".oversized.mp4"):
+                try:
+                    os.remove(os.path.join(self.incoming_dir, filename))
+                except OSError:
+                    pass
+        self.max_bytes = max_bytes
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+        # Content digest -> size, least recently used first (rebuilt from file access times on startup)
+        self._index = OrderedDict()
+        # Video ref -> content digest
+        self._refs = {}
+        # Video ref -> downloaded file too large to store; kept until the process restarts
+        self._oversized = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+        files = []
+        for filename in os.listdir(self.objects_dir):
+            path = os.path.join(self.objects_dir, filename)
+            if filename.endswith(".mp4") and os.path.isfile(path):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, filename[:-4], stat.st_size))
+        for _, digest, size in sorted(files):
+            self._index[digest] = size
+            self.total_bytes += size
+        for ref in os.listdir(self.refs_dir):
+            try:
+                with open(os.path.join(self.refs_dir, ref)) as f:
+                    digest = f.read().strip()
+            except OSError:
+                continue
+            if digest in self._index:
+                self._refs[ref] = digest
+
+    def _ref(self, video_id):
+        return hashlib.sha256(str(video_id).encode("utf-8")).hexdigest()[:32]
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, f"{digest}.mp4")
+
+    def has(self, video_id):
+        """Whether a video is stored, without touching its recency"""
+        with self._lock:
+            return self._refs.get(self._ref(video_id)) in self._index
+
+    def path(self, video_id):
+        """Return the local path of a stored video (marking it recently used), or None"""
+        ref = self._ref(video_id)
+        with self._lock:
+            digest = self._refs.get(ref)
+            if digest is None or digest not in self._index:
+                return None
+            self._index.move_to_end(digest)
+        path = self._object_path(digest)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.total_bytes -= self._index.pop(digest, 0)
+                self._refs.pop(ref, None)
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def fetch(self, video_id, url, http, progress=None, budget=None, segments=1):
+        """Return the local path of a video, downloading it on a miss, or None on failure.
+        
+        The store outlives the rerun that created it, so the current rerun's client and retry
+        budget are passed in rather than read from module globals.
+        """
+        ref = self._ref(video_id)
+        with self._lock:
+            oversized = self._oversized.get(ref)
+        if oversized is not None and os.path.exists(oversized):
+            return oversized
+        return self.path(video_id) or self._flights.do(
+            ref, lambda: self.path(video_id) or self._store(ref, url, http, progress, budget, segments)
+        )
+
+    def _store(self, ref, url, http, progress=None, budget=None, segments=1):
+        with self._lock:
+            self.misses += 1
+        # Interrupted downloads leave a partial file here that the next attempt resumes
+        incoming = os.path.join(self.incoming_dir, f"{ref}.mp4")
+        if download_video(url, incoming, progress, budget, segments, http) is None:
+            return None
+        
+        digest = hashlib.sha256()
+        size = 0
+        with open(incoming, "rb") as f:
+            for chunk in iter(lambda: f.read(VIDEO_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                size += len(chunk)
+        digest = digest.hexdigest()
+        path = self._object_path(digest)
+        
+        if size > self.max_bytes:
+            # Larger than the whole budget: hand out the downloaded file without storing it
+            oversized = os.path.join(self.incoming_dir, f"{ref}.oversized.mp4")
+            os.replace(incoming, oversized)
+            with self._lock:
+                self._oversized[ref] = oversized
+            return oversized
+        
+        with self._lock:
+            if digest in self._index:
+                # Same content under another video id: keep a single copy
+                self.deduplicated += 1
+                os.remove(incoming)
+                self._index.move_to_end(digest)
+            else:
+                os.replace(incoming, path)
+                self._index[digest] = size
+                self.total_bytes += size
+            ref_path = os.path.join(self.refs_dir, ref)
+            with open(ref_path + ".tmp", "w") as f:
+                f.write(digest)
+            os.replace(ref_path + ".tmp", ref_path)
+            self._refs[ref] = digest
+            self._evict()
+        return path
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._index:
+            digest, size = self._index.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self._object_path(digest))
+            except OSError:
+                pass
+            for ref in [ref for ref, target in self._refs.items() if target == digest]:
+                del self._refs[ref]
+                try:
+                    os.remove(os.path.join(self.refs_dir, ref))
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            return {"files": len(self._index), "bytes": self.total_bytes, "hits": self.hits,
+                    "misses": self.misses, "deduplicated": self.deduplicated}
+
+@st.cache_resource
+def get_video_store():
+    """Open the on-disk video store once per process"""
+    return VideoStore(VIDEO_DIR, VIDEO_STORE_BYTES)
+
+video_store = get_video_store()
+
+# Function to fetch a video only once it is requested, reusing the stored file across reruns
+def fetch_video_for_download(video_id, url, progress=None):
+    """Path of the stored video; failures raise so the next request retries"""
+    path = video_store.fetch(video_id, url, client, progress, budget=retry_budget, segments=download_segments)
+    if path is None:
+        raise requests.exceptions.RequestException(f"Could not download video from {url}")
+    return path
+
+# Catalog endpoints loaded before the tabs render
+CATALOG_LOADERS = {
+    "avatars": get_avatars,
+    "voices": get_voices,
+}
+
+@st.cache_resource
+def get_catalog_executor():
+    """Small process-wide thread pool used to fetch catalogs concurrently"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="pipio-catalog")
+
+# Function to run a callable on a worker thread with the caller's Streamlit context
+def run_with_script_ctx(ctx, fn, *args):
+    thread = threading.current_thread()
+    previous = get_script_run_ctx(suppress_warning=True)
+    add_script_run_ctx(thread, ctx)
+    try:
+        return fn(*args)
+    finally:
+        # Pool threads are reused; don't keep a finished session's context attached
+        add_script_run_ctx(thread, previous)
+
+# Function to fetch every catalog concurrently
+def load_catalogs(api_key):
+    """Fetch all catalogs in parallel and return them keyed by catalog name"""
+    catalog_refresher.register(api_key, cache_ttl * 60, CATALOG_FETCHERS)
+    ctx = get_script_run_ctx()
+    executor = get_catalog_executor()
+    futures = {
+        name: executor.submit(run_with_script_ctx, ctx, loader, api_key)
+        for name, loader in CATALOG_LOADERS.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+# Server-side thumbnail cache for avatar preview images
+THUMBNAIL_CACHE_BYTES = int(os.environ.get("PIPIO_THUMBNAIL_CACHE_BYTES", 64 * 1024 * 1024))
+THUMBNAIL_QUALITY = 80
+# Images that could not be fetched or decoded are not retried for this long
+THUMBNAIL_FAILURE_TTL = 300.0
+THUMBNAIL_TIMEOUT = 3
+
+class ThumbnailCache:
+    """Fetches preview images once, re-encodes them small with Pillow and keeps an LRU on disk"""
+
+    def __init__(self, directory, max_bytes):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+        # Least recently used first, rebuilt from file access times on startup
+        self._index = OrderedDict()
+        self._failures = {}
+        # Thumbnails queued or running in the background, so reruns don't queue them again
+        self._pending = set()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        files = []
+        for filename in os.listdir(directory):
+            path = os.path.join(directory, filename)
+            if os.path.isfile(path) and not filename.endswith(".tmp"):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, filename, stat.st_size))
+        for _, filename, size in sorted(files):
+            self._index[filename] = size
+            self.total_bytes += size
+
+    def _filename(self, url, size):
+        return hashlib.sha256(f"{size}:{url}".encode("utf-8")).hexdigest() + ".img"
+
+    def peek(self, url, size):
+        """Return cached thumbnail bytes for url without fetching, or None"""
+        return self._read(self._filename(url, size))
+
+    def get(self, url, size, http, budget=None):
+        """Return thumbnail bytes for url (fetching and caching on a miss), or None on failure.
+        
+        http is the current rerun's client; this object outlives the rerun that created it.
+        """
+        filename = self._filename(url, size)
+        data = self._read(filename)
+        if data is not None:
+            return data
+        with self._lock:
+            failed_at = self._failures.get(filename)
+        if failed_at is not None and time.time() - failed_at < THUMBNAIL_FAILURE_TTL:
+            return None
+        return self._flights.do(filename, lambda: self._read(filename) or self._create(url, size, filename, http, budget))
+
+    def reserve(self, url, size):
+        """Claim a background fetch for url; False if it is cached, recently failed, or already queued"""
+        filename = self._filename(url, size)
+        with self._lock:
+            if filename in self._index or filename in self._pending:
+                return False
+            failed_at = self._failures.get(filename)
+            if failed_at is not None and time.time() - failed_at < THUMBNAIL_FAILURE_TTL:
+                return False
+            self._pending.add(filename)
+            return True
+
+    def fetch_reserved(self, url, size, http, budget=None):
+        """Run a fetch claimed with reserve()"""
+        try:
+            return self.get(url, size, http, budget)
+        finally:
+            with self._lock:
+                self._pending.discard(self._filename(url, size))
+
+    def _read(self, filename):
+        with self._lock:
+            if filename not in self._index:
+                return None
+            self._index.move_to_end(filename)
+        path = os.path.join(self.directory, filename)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.total_bytes -= self._index.pop(filename, 0)
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def _create(self, url, size, filename, http, budget=None):
+        with self._lock:
+            self.misses += 1
+        try:
+            response = http.get(url, timeout=THUMBNAIL_TIMEOUT, policy=RETRY_POLICIES["thumbnail"], budget=budget, circuit="images")
+            response.raise_for_status()
+            data = make_thumbnail(response.content, size)
+        except Exception:
+            # Let the browser fall back to the original image
+            with self._lock:
+                self._failures[filename] = time.time()
+            return None
+        
+        path = os.path.join(self.directory, filename)
+        try:
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            return data
+        with self._lock:
+            self.total_bytes += len(data) - self._index.pop(filename, 0)
+            self._index[filename] = len(data)
+            self._evict()
+        return data
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._index) > 1:
+            filename, size = self._index.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {"files": len(self._index), "bytes": self.total_bytes, "hits": self.hits, "misses": self.misses}
+
+# Function to resize and re-encode an image for the avatar grid
+def make_thumbnail(content, size):
+    image = Image.open(BytesIO(content))
+    image.thumbnail((size, size))
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    output = BytesIO()
+    try:
+        image.save(output, format="WEBP", quality=THUMBNAIL_QUALITY, method=4)
+    except (KeyError, OSError):
+        # Pillow built without WebP support
+        output = BytesIO()
+        image.save(output, format="PNG", optimize=True)
+    return output.getvalue()
+
+@st.cache_resource
+def get_thumbnail_cache():
+    """Open the on-disk thumbnail cache once per process"""
+    return ThumbnailCache(os.path.join(CACHE_DIR, "thumbnails"), THUMBNAIL_CACHE_BYTES)
+
+thumbnail_cache = get_thumbnail_cache()
+
+# Function to get what st.image should display for an avatar preview
+def avatar_thumbnail(url, size):
+    """Return cached thumbnail bytes, or the original URL while the thumbnail is fetched in the background"""
+    data = thumbnail_cache.peek(url, size)
+    if data is None:
+        # Never block the render on an image host; a later rerun picks the thumbnail up
+        request_thumbnail(url, size)
+        return url
+    return data
+
+@st.cache_resource
+def get_thumbnail_executor():
+    """Bounded thread pool that warms thumbnails ahead of rendering"""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="pipio-thumbnails")
+
+# Function to fetch one thumbnail in the background
+def request_thumbnail(url, size):
+    # Each image is queued at most once until its fetch finishes
+    if thumbnail_cache.reserve(url, size):
+        get_thumbnail_executor().submit(thumbnail_cache.fetch_reserved, url, size, client, retry_budget)
+
+# Function to warm the thumbnail cache for a set of avatars in parallel
+def prefetch_thumbnails(avatar_records, size):
+    for avatar in avatar_records:
+        if avatar.preview_image_url:
+            request_thumbnail(avatar.preview_image_url, size)
+
+# Function to compose one page of avatar thumbnails into a single contact-sheet image
+def build_contact_sheet(catalog_version, tiles, columns, tile_size=150):
+    """Render (label, preview URL) tiles into a numbered grid image, cached per page and catalog version once complete"""
+    missing = [url for _, url in tiles if url and thumbnail_cache.peek(url, tile_size) is None]
+    if not missing:
+        return cached_contact_sheet(catalog_version, tiles, columns, tile_size)
+    # Sheets with placeholder tiles are not cached, so they fill in once the thumbnails arrive
+    for url in missing:
+        request_thumbnail(url, tile_size)
+    return render_contact_sheet(tiles, columns, tile_size)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def cached_contact_sheet(catalog_version, tiles, columns, tile_size):
+    return render_contact_sheet(tiles, columns, tile_size)
+
+# Function to draw a contact sheet from the thumbnails already on disk
+def render_contact_sheet(tiles, columns, tile_size):
+    rows = max(1, -(-len(tiles) // columns))
+    sheet = Image.new("RGB", (columns * tile_size, rows * tile_size), "white")
+    draw = ImageDraw.Draw(sheet)
+    for position, (label, url) in enumerate(tiles):
+        left = (position % columns) * tile_size
+        top = (position // columns) * tile_size
+        thumbnail = thumbnail_cache.peek(url, tile_size) if url else None
+        if thumbnail is not None:
+            with Image.open(BytesIO(thumbnail)) as tile:
+                tile = tile.convert("RGBA")
+                offset = (left + (tile_size - tile.width) // 2, top + (tile_size - tile.height) // 2)
+                sheet.paste(tile, offset, tile)
+        else:
+            draw.rectangle([left + 4, top + 4, left + tile_size - 5, top + tile_size - 5], outline="#CCCCCC")
+        # Number each tile so it can be matched with its select button
+        draw.rectangle([left, top, left + 24, top + 16], fill="#333333")
+        draw.text((left + 4, top + 2), label, fill="white")
+    
+    output = BytesIO()
+    try:
+        sheet.save(output, format="WEBP", quality=THUMBNAIL_QUALITY)
+    except (KeyError, OSError):
+        output = BytesIO()
+        sheet.save(output, format="JPEG", quality=THUMBNAIL_QUALITY)
+    return output.getvalue()
+
+# Page sizes offered for the avatar gallery
+AVATAR_PAGE_SIZES = [6, 12, 24, 48]
+
 # Function to add to history
 def add_to_history(action, details):
     st.session_state.history.append({
@@ -459,16 +2410,17 @@ st.session_state.last_api_check = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 # Load avatars and voices
 with st.spinner("Loading avatars and voices..."):
-    avatars = get_avatars(api_key)
-    voices = get_voices(api_key)
+    catalogs = load_catalogs(api_key)
+    avatars = catalogs["avatars"]
+    voices = catalogs["voices"]
 
 # Check if we got valid data
 if show_debug:
-    st.write(f"Avatars type: {type(avatars)}, length: {len(avatars) if isinstance(avatars, list) else 'N/A'}")
-    st.write(f"Voices type: {type(voices)}, length: {len(voices) if isinstance(voices, list) else 'N/A'}")
+    st.write(f"Avatars: {len(avatars)} valid of {len(avatars.items)} records (catalog version {avatars.version})")
+    st.write(f"Voices: {len(voices)} valid of {len(voices.items)} records (catalog version {voices.version})")
 
-# Verify we have valid lists - treat empty lists as failed too
-if not isinstance(avatars, list) or not isinstance(voices, list) or len(avatars) == 0 or len(voices) == 0:
+# Verify we have valid records - treat empty catalogs as failed too
+if len(avatars) == 0 or len(voices) == 0:
     # Create an error container with custom styling
     st.markdown("""
     <style>
@@ -519,15 +2471,11 @@ if not isinstance(avatars, list) or not isinstance(voices, list) or len(avatars)
     
     # Specific error details
     error_details = []
-    if not isinstance(avatars, list):
-        error_details.append(f"• Avatar data is not in the expected format: received {type(avatars).__name__} instead of list")
-    elif len(avatars) == 0:
-        error_details.append("• No avatars were found in the API response")
+    if len(avatars) == 0:
+        error_details.append("• No valid avatars were found in the API response")
     
-    if not isinstance(voices, list):
-        error_details.append(f"• Voice data is not in the expected format: received {type(voices).__name__} instead of list")
-    elif len(voices) == 0:
-        error_details.append("• No voices were found in the API response")
+    if len(voices) == 0:
+        error_details.append("• No valid voices were found in the API response")
     
     # Add API error details if available
     if st.session_state.api_errors:
@@ -554,8 +2502,8 @@ if not isinstance(avatars, list) or not isinstance(voices, list) or len(avatars)
     if use_mock_data:
         st.markdown('<div class="troubleshooting-step"><strong>6. Use mock data</strong><br>You can continue using the application with mock data for testing purposes. Note that video generation will not work with mock data.</div>', unsafe_allow_html=True)
         if st.button("Continue with Mock Data", type="primary"):
-            avatars = get_mock_avatars()
-            voices = get_mock_voices()
+            avatars = Catalog("actor", get_mock_avatars())
+            voices = Catalog("voice", get_mock_voices())
             st.success("Mock data loaded successfully. You can now explore the application interface.")
             st.rerun()
     else:
@@ -570,20 +2518,14 @@ if not isinstance(avatars, list) or not isinstance(voices, list) or len(avatars)
         st.write("API key length:", len(api_key) if api_key else "No API key provided")
         
         st.subheader("Avatar API Response")
-        if isinstance(avatars, list):
-            st.write("Avatar count:", len(avatars))
-            if len(avatars) > 0:
-                st.write("Sample avatar:", avatars[0])
-        else:
-            st.write("Avatar data:", avatars)
+        st.write("Avatar count:", len(avatars.items))
+        if avatars.items:
+            st.write("Sample avatar:", RESPONSE_SCHEMAS["actor"].as_dict(avatars.items[0]))
         
         st.subheader("Voice API Response")
-        if isinstance(voices, list):
-            st.write("Voice count:", len(voices))
-            if len(voices) > 0:
-                st.write("Sample voice:", voices[0])
-        else:
-            st.write("Voice data:", voices)
+        st.write("Voice count:", len(voices.items))
+        if voices.items:
+            st.write("Sample voice:", RESPONSE_SCHEMAS["voice"].as_dict(voices.items[0]))
         
         st.subheader("Recent API Errors")
         if st.session_state.api_errors:
@@ -620,17 +2562,9 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs(["Select Avatar & Voice", "Generate Video
 with tab1:
     st.header("Available Avatars")
     
-    # Create dictionaries for easy lookup - with safe access
-    avatar_dict = {}
-    avatar_names = {}
-    
-    for avatar in avatars:
-        if isinstance(avatar, dict):
-            avatar_id = safe_get(avatar, "id")
-            if avatar_id:
-                avatar_dict[avatar_id] = avatar
-                avatar_name = safe_get(avatar, "name", f"Unknown-{avatar_id}")
-                avatar_names[avatar_name] = avatar_id
+    # Lookup indexes are prebuilt once per catalog version
+    avatar_dict = avatars.by_id
+    avatar_names = avatars.name_to_id
     
     # Display avatars in a grid with selection
     if not avatar_dict:
@@ -639,102 +2573,109 @@ with tab1:
         # Add search filter
         avatar_search = st.text_input("Search Avatars", "")
         
-        # Filter avatars based on search
-        filtered_avatar_names = {name: id for name, id in avatar_names.items() 
-                               if not avatar_search or avatar_search.lower() in name.lower()}
+        # Filter avatars based on search, best matches first
+        filtered_avatar_names = {avatar_dict[avatar_id].name: avatar_id
+                                 for avatar_id in avatars.search_index.search(avatar_search)}
         
         if not filtered_avatar_names:
             st.warning(f"No avatars found matching '{avatar_search}'")
         else:
             st.success(f"Found {len(filtered_avatar_names)} avatars")
             
-            # Calculate number of columns based on screen width
-            avatar_cols = st.columns(3)
+            # Gallery layout controls
+            layout_col1, layout_col2, layout_col3 = st.columns(3)
+            with layout_col1:
+                avatars_per_page = st.selectbox("Avatars per page", AVATAR_PAGE_SIZES, index=1)
+            with layout_col2:
+                avatar_columns = st.slider("Columns", 2, 6, 3)
+            contact_sheet_mode = st.checkbox("Contact sheet mode (one image per page)", value=False)
             
-            for i, (avatar_name, avatar_id) in enumerate(filtered_avatar_names.items()):
-                avatar = avatar_dict[avatar_id]
-                with avatar_cols[i % 3]:
-                    # Create a container for each avatar
-                    with st.container():
-                        st.subheader(avatar_name)
-                        avatar_image = safe_get(avatar, "previewImageUrl")
-                        if avatar_image:
-                            st.image(avatar_image, width=150)
-                        else:
-                            st.image("https://placeholder.svg?height=150&width=150&query=No+Preview", width=150)
-                        
-                        # Add description if available
-                        avatar_desc = safe_get(avatar, "description")
-                        if avatar_desc:
-                            st.caption(avatar_desc)
-                        
-                        # Selection button
-                        if st.button(f"Select {avatar_name}", key=f"select_avatar_{i}"):
+            # A new search starts again from the first page
+            if st.session_state.avatar_search_last != avatar_search:
+                st.session_state.avatar_search_last = avatar_search
+                st.session_state.avatar_page = 1
+            page_count = max(1, -(-len(filtered_avatar_names) // avatars_per_page))
+            if st.session_state.avatar_page > page_count:
+                st.session_state.avatar_page = page_count
+            with layout_col3:
+                avatar_page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, step=1, key="avatar_page")
+            
+            # Only the visible slice of the gallery is rendered
+            page_start = (avatar_page - 1) * avatars_per_page
+            gallery_items = list(filtered_avatar_names.items())
+            page_items = gallery_items[page_start:page_start + avatars_per_page]
+            
+            # Warm the visible and the next page concurrently whenever the view changes
+            prefetch_key = (avatars.version, avatar_search, avatar_page, avatars_per_page)
+            if st.session_state.get("avatar_prefetch_key") != prefetch_key:
+                st.session_state.avatar_prefetch_key = prefetch_key
+                prefetch_ids = [avatar_id for _, avatar_id in gallery_items[page_start:page_start + 2 * avatars_per_page]]
+                prefetch_thumbnails([avatar_dict[avatar_id] for avatar_id in prefetch_ids], 150)
+            
+            if contact_sheet_mode:
+                # One composed image for the whole page, selection via numbered buttons
+                tiles = tuple((str(n + 1), avatar_dict[avatar_id].preview_image_url) for n, (_, avatar_id) in enumerate(page_items))
+                st.image(build_contact_sheet(avatars.version, tiles, avatar_columns))
+                avatar_cols = st.columns(avatar_columns)
+                for i, (avatar_name, avatar_id) in enumerate(page_items):
+                    with avatar_cols[i % avatar_columns]:
+                        selected_marker = "✅ " if st.session_state.selected_avatar == avatar_id else ""
+                        if st.button(f"{selected_marker}{i + 1}. {avatar_name}", key=f"select_avatar_{avatar_id}", use_container_width=True):
                             st.session_state.selected_avatar = avatar_id
                             add_to_history("Selected Avatar", avatar_name)
                             st.success(f"Selected avatar: {avatar_name}")
+            else:
+                avatar_cols = st.columns(avatar_columns)
+                
+                for i, (avatar_name, avatar_id) in enumerate(page_items):
+                    avatar = avatar_dict[avatar_id]
+                    with avatar_cols[i % avatar_columns]:
+                        # Create a container for each avatar
+                        with st.container():
+                            st.subheader(avatar_name)
+                            avatar_image = avatar.preview_image_url
+                            if avatar_image:
+                                st.image(avatar_thumbnail(avatar_image, 150), width=150)
+                            else:
+                                st.image("https://placeholder.svg?height=150&width=150&query=No+Preview", width=150)
+                            
+                            # Add description if available
+                            avatar_desc = avatar.description
+                            if avatar_desc:
+                                st.caption(avatar_desc)
+                            
+                            # Selection button, keyed by id so selection survives paging and searching
+                            if st.session_state.selected_avatar == avatar_id:
+                                st.caption("✅ Selected")
+                            if st.button(f"Select {avatar_name}", key=f"select_avatar_{avatar_id}"):
+                                st.session_state.selected_avatar = avatar_id
+                                add_to_history("Selected Avatar", avatar_name)
+                                st.success(f"Selected avatar: {avatar_name}")
     
     st.header("Available Voices")
     
-    # Create voice dictionaries - with safe access
-    voice_dict = {}
-    voice_names = {}
-    
-    for voice in voices:
-        if isinstance(voice, dict):
-            voice_id = safe_get(voice, "id")
-            if voice_id:
-                voice_dict[voice_id] = voice
-                voice_name = safe_get(voice, "name", "Unknown")
-                voice_gender = safe_get(voice, "gender", "Not specified")
-                voice_language = safe_get(voice, "language", "Not specified")
-                display_name = f"{voice_name} ({voice_gender}, {voice_language})"
-                voice_names[display_name] = voice_id
+    # Lookup indexes and display names are prebuilt once per catalog version
+    voice_dict = voices.by_id
+    voice_names = voices.display_to_id
     
     # Create a dataframe for better display
     if not voice_dict:
         st.warning("No valid voices found. Please check your API key or try again later.")
     else:
-        voice_data = []
-        for voice_id, voice in voice_dict.items():
-            voice_data.append({
-                "Name": safe_get(voice, "name", "Unknown"),
-                "Gender": safe_get(voice, "gender", "Not specified"),
-                "Language": safe_get(voice, "language", "Not specified"),
-                "Accent": safe_get(voice, "accent", "Not specified"),
-                "ID": voice_id
-            })
-        
-        # Convert to dataframe
-        df = pd.DataFrame(voice_data)
-        
         # Add search filter
         voice_search = st.text_input("Search Voices", "")
         
         # Add filters
         col1, col2, col3 = st.columns(3)
         with col1:
-            gender_filter = st.multiselect("Filter by Gender", options=df["Gender"].unique(), default=[])
+            gender_filter = st.multiselect("Filter by Gender", options=voices.facets["Gender"], default=[])
         with col2:
-            language_filter = st.multiselect("Filter by Language", options=df["Language"].unique(), default=[])
+            language_filter = st.multiselect("Filter by Language", options=voices.facets["Language"], default=[])
         with col3:
-            accent_filter = st.multiselect("Filter by Accent", options=df["Accent"].unique(), default=[])
+            accent_filter = st.multiselect("Filter by Accent", options=voices.facets["Accent"], default=[])
         
-        # Apply filters
-        filtered_df = df
-        if gender_filter:
-            filtered_df = filtered_df[filtered_df["Gender"].isin(gender_filter)]
-        if language_filter:
-            filtered_df = filtered_df[filtered_df["Language"].isin(language_filter)]
-        if accent_filter:
-            filtered_df = filtered_df[filtered_df["Accent"].isin(accent_filter)]
-        
-        # Apply search filter
-        if voice_search:
-            filtered_df = filtered_df[filtered_df["Name"].str.contains(voice_search, case=False) | 
-                                     filtered_df["Gender"].str.contains(voice_search, case=False) | 
-                                     filtered_df["Language"].str.contains(voice_search, case=False) | 
-                                     filtered_df["Accent"].str.contains(voice_search, case=False)]
+        # Apply filters and search (memoized per catalog version and filter combination)
+        filtered_df, filtered_voice_names = voices.filter_voices(gender_filter, language_filter, accent_filter, voice_search)
         
         # Display filtered dataframe
         if len(filtered_df) == 0:
@@ -744,12 +2685,6 @@ with tab1:
             st.dataframe(filtered_df, use_container_width=True)
             
             # Voice selection
-            # Create a dictionary of display names for the filtered dataframe
-            filtered_voice_names = {}
-            for _, row in filtered_df.iterrows():
-                display_name = f"{row['Name']} ({row['Gender']}, {row['Language']})"
-                filtered_voice_names[display_name] = row['ID']
-            
             if filtered_voice_names:
                 selected_voice_name = st.selectbox("Select Voice", options=list(filtered_voice_names.keys()))
                 if st.button("Confirm Voice Selection"):
@@ -770,14 +2705,14 @@ with tab2:
         if st.session_state.selected_avatar and st.session_state.selected_avatar in avatar_dict:
             avatar = avatar_dict.get(st.session_state.selected_avatar)
             if avatar:
-                st.write(f"**Name:** {safe_get(avatar, 'name', 'Unknown')}")
-                avatar_image = safe_get(avatar, "previewImageUrl")
+                st.write(f"**Name:** {avatar.name}")
+                avatar_image = avatar.preview_image_url
                 if avatar_image:
-                    st.image(avatar_image, width=200)
+                    st.image(avatar_thumbnail(avatar_image, 200), width=200)
                 st.write(f"**ID:** {st.session_state.selected_avatar}")
                 
                 # Add description if available
-                avatar_desc = safe_get(avatar, "description")
+                avatar_desc = avatar.description
                 if avatar_desc:
                     st.write(f"**Description:** {avatar_desc}")
         else:
@@ -788,10 +2723,10 @@ with tab2:
         if st.session_state.selected_voice and st.session_state.selected_voice in voice_dict:
             voice = voice_dict.get(st.session_state.selected_voice)
             if voice:
-                st.write(f"**Name:** {safe_get(voice, 'name', 'Unknown')}")
-                st.write(f"**Gender:** {safe_get(voice, 'gender', 'Not specified')}")
-                st.write(f"**Language:** {safe_get(voice, 'language', 'Not specified')}")
-                st.write(f"**Accent:** {safe_get(voice, 'accent', 'Not specified')}")
+                st.write(f"**Name:** {voice.name}")
+                st.write(f"**Gender:** {voice.gender}")
+                st.write(f"**Language:** {voice.language}")
+                st.write(f"**Accent:** {voice.accent}")
                 st.write(f"**ID:** {st.session_state.selected_voice}")
         else:
             st.warning("No voice selected. Please go to the 'Select Avatar & Voice' tab.")
@@ -860,8 +2795,10 @@ with tab2:
                     st.success(f"Video generation started! Video ID: {video_id}")
                     
                     # Get avatar and voice names for display
-                    avatar_name = safe_get(avatar_dict.get(avatar_id, {}), "name", "Unknown Avatar")
-                    voice_name = safe_get(voice_dict.get(voice_id, {}), "name", "Unknown Voice")
+                    avatar_record = avatar_dict.get(avatar_id)
+                    voice_record = voice_dict.get(voice_id)
+                    avatar_name = avatar_record.name if avatar_record else "Unknown Avatar"
+                    voice_name = voice_record.name if voice_record else "Unknown Voice"
                     
                     # Save video ID to session state for tracking
                     st.session_state.videos.append({
@@ -956,17 +2893,66 @@ with tab3:
                 
                 # Video preview and download
                 if video['status'] == "completed" and video['url']:
-                    st.video(video['url'])
+                    # Streamlit reads local files into memory on every rerun, so the stored copy is only played on request
+                    local_video = None
+                    if video['id'] in st.session_state.local_playback:
+                        try:
+                            with st.spinner("Fetching video into the local store..."):
+                                local_video = fetch_video_for_download(video['id'], video['url'])
+                        except requests.exceptions.RequestException:
+                            st.session_state.local_playback.discard(video['id'])
+                            st.error("Could not store the video locally; playing it from the remote URL.")
+                    st.video(local_video or video['url'])
+                    if local_video:
+                        if st.button("Stop Stored Copy", key=f"stop_local_{i}"):
+                            st.session_state.local_playback.discard(video['id'])
+                            st.rerun()
+                    else:
+                        stored = video_store.has(video['id'])
+                        play_label = "Play Stored Copy" if stored else "Store & Play Locally"
+                        play_help = "Plays the stored file without fetching the video again" if stored else "Downloads the video once into the local store; later previews and downloads use no network"
+                        if st.button(play_label, key=f"play_local_{i}", help=play_help):
+                            st.session_state.local_playback.add(video['id'])
+                            st.rerun()
                     
                     col1, col2 = st.columns(2)
                     with col1:
-                        # Download button
-                        video_content = download_video(video['url'])
-                        if video_content:
-                            b64_video = base64.b64encode(video_content).decode()
-                            download_filename = f"pipio_video_{video['id']}.mp4"
-                            href = f'<a href="data:video/mp4;base64,{b64_video}" download="{download_filename}" class="button">Download Video</a>'
-                            st.markdown(href, unsafe_allow_html=True)
+                        # The video is only fetched once the user asks for it
+                        if video['id'] not in st.session_state.requested_downloads:
+                            if st.button("Prepare Download", key=f"prepare_download_{i}", use_container_width=True):
+                                st.session_state.requested_downloads.add(video['id'])
+                        
+                        if video['id'] in st.session_state.requested_downloads:
+                            try:
+                                progress_placeholder = st.empty()
+                                
+                                def show_download_progress(done, total):
+                                    if total:
+                                        progress_placeholder.progress(min(done / total, 1.0), text=f"Downloading video... {done / (1024 * 1024):.1f} of {total / (1024 * 1024):.1f} MB")
+                                    else:
+                                        progress_placeholder.progress(0.0, text=f"Downloading video... {done / (1024 * 1024):.1f} MB")
+                                
+                                with st.spinner("Downloading video..."):
+                                    video_path = fetch_video_for_download(video['id'], video['url'], show_download_progress)
+                                progress_placeholder.empty()
+                                # Hand Streamlit the file itself rather than a base64 copy
+                                video_file = open(video_path, "rb")
+                            except (requests.exceptions.RequestException, OSError):
+                                st.session_state.requested_downloads.discard(video['id'])
+                                st.error("Video download failed. Check the API Status tab for details.")
+                            else:
+                                with video_file:
+                                    downloaded = st.download_button(
+                                        "Download Video",
+                                        video_file,
+                                        file_name=f"pipio_video_{video['id']}.mp4",
+                                        mime="video/mp4",
+                                        key=f"download_{i}",
+                                        use_container_width=True
+                                    )
+                                # Stop re-reading the file on later reruns once it has been downloaded
+                                if downloaded:
+                                    st.session_state.requested_downloads.discard(video['id'])
                     
                     with col2:
                         # Copy video URL button
@@ -1061,17 +3047,64 @@ with tab5:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        avatar_status = "✅ Connected" if isinstance(avatars, list) and len(avatars) > 0 else "❌ Error"
+        avatar_status = "✅ Connected" if len(avatars) > 0 else "❌ Error"
         st.metric("Avatar API", avatar_status)
     
     with col2:
-        voice_status = "✅ Connected" if isinstance(voices, list) and len(voices) > 0 else "❌ Error"
+        voice_status = "✅ Connected" if len(voices) > 0 else "❌ Error"
         st.metric("Voice API", voice_status)
     
     with col3:
         last_check = st.session_state.last_api_check if st.session_state.last_api_check else "Never"
         st.metric("Last API Check", last_check)
     
+    # Circuit breaker state per host
+    st.subheader("Circuit Breakers")
+    breaker_df = pd.DataFrame([breaker.snapshot() for breaker in circuit_breakers.values()])
+    st.dataframe(breaker_df, use_container_width=True)
+    if any(breaker.state != "closed" for breaker in circuit_breakers.values()):
+        st.warning("One or more Pipio hosts are failing. Requests to them fail fast until a probe succeeds.")
+        if st.button("Reset Circuit Breakers"):
+            for breaker in circuit_breakers.values():
+                breaker.reset()
+            st.success("Circuit breakers reset")
+            st.rerun()
+    
+    # Catalog cache statistics and controls
+    st.subheader("Catalog Cache")
+    cache_stats = catalog_cache.stats()
+    cache_col1, cache_col2, cache_col3, cache_col4 = st.columns(4)
+    with cache_col1:
+        st.metric("Cached Catalogs", cache_stats["entries"])
+    with cache_col2:
+        st.metric("Cache Hits", cache_stats["hits"])
+    with cache_col3:
+        st.metric("Cache Misses", cache_stats["misses"])
+        st.caption(f"{cache_stats['stale_hits']} served stale, {cache_stats['revalidating']} refreshing, {cache_stats['not_modified']} revalidated via 304")
+    st.caption(f"Background refresher: {catalog_refresher.active_keys()} active API keys, {catalog_refresher.refreshes} proactive refreshes")
+    st.caption(f"Single-flight: {catalog_flights.executed} catalog fetches, {catalog_flights.coalesced} concurrent requests coalesced")
+    thumbnail_stats = thumbnail_cache.stats()
+    st.caption(f"Thumbnails: {thumbnail_stats['files']} cached ({thumbnail_stats['bytes'] / (1024 * 1024):.1f} of {THUMBNAIL_CACHE_BYTES / (1024 * 1024):.0f} MB), {thumbnail_stats['hits']} hits, {thumbnail_stats['misses']} misses")
+    video_stats = video_store.stats()
+    st.caption(f"Videos: {video_stats['files']} stored ({video_stats['bytes'] / (1024 * 1024):.1f} of {VIDEO_STORE_BYTES / (1024 * 1024):.0f} MB), {video_stats['hits']} local plays/downloads, {video_stats['misses']} downloads, {video_stats['deduplicated']} duplicates shared")
+    with cache_col4:
+        st.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+    st.caption(f"Catalogs are fresh for {cache_ttl} minutes (see Advanced Settings); older copies, including the one kept on disk across restarts, are served while a fresh copy is fetched in the background.")
+    
+    refresh_col, clear_col = st.columns(2)
+    with refresh_col:
+        if st.button("Refresh Catalogs", use_container_width=True):
+            catalog_cache.invalidate(hash_api_key(api_key))
+            catalog_store.delete(hash_api_key(api_key))
+            st.success("Catalogs will be re-fetched")
+            st.rerun()
+    with clear_col:
+        if st.button("Clear Entire Catalog Cache", use_container_width=True):
+            catalog_cache.invalidate()
+            catalog_store.delete()
+            st.success("Catalog cache cleared")
+            st.rerun()
+    
     # API Error Log
     st.subheader("API Error Log")
     
@@ -1090,6 +3123,22 @@ with tab5:
             st.success("Error log cleared")
             st.rerun()
     
+    if background_errors:
+        with st.expander(f"Background refresh errors ({len(background_errors)})"):
+            background_df = pd.DataFrame(list(background_errors))
+            st.dataframe(background_df[["timestamp", "endpoint", "error_type", "error_message"]], use_container_width=True)
+    
+    # JSON codec in use and a micro-benchmark against the standard library
+    st.subheader("JSON Codec")
+    st.write(f"Active codec: **{JSON_CODEC}** (install `orjson` or `ujson` for faster decoding)")
+    benchmark_records = st.select_slider("Benchmark catalog size (records)", options=[1000, 5000, 20000, 50000], value=5000)
+    if st.button("Run Codec Benchmark"):
+        with st.spinner("Benchmarking JSON codecs..."):
+            st.dataframe(pd.DataFrame(benchmark_json_codec(benchmark_records)), use_container_width=True)
+    if st.button("Run Normalizer Benchmark"):
+        with st.spinner("Benchmarking response normalization..."):
+            st.dataframe(pd.DataFrame(benchmark_normalizer(benchmark_records)), use_container_width=True)
+    
     # API Test Tool
     st.subheader("API Test Tool")
     
@@ -1098,70 +3147,12 @@ with tab5:
     with test_col1:
         if st.button("Test Avatar API", use_container_width=True):
             with st.spinner("Testing Avatar API..."):
-                try:
-                    response = requests.get(
-                        "https://avatar.pipio.ai/actor",
-                        headers={"Authorization": f"Key {api_key}", "Accept": "application/json"},
-                        timeout=10
-                    )
-                    
-                    st.write(f"Status Code: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        st.success("Avatar API connection successful")
-                        try:
-                            data = response.json()
-                            st.write(f"Response Type: {type(data)}")
-                            if isinstance(data, dict):
-                                st.write(f"Keys: {list(data.keys())}")
-                                if 'actors' in data:
-                                    st.write(f"Found {len(data['actors'])} avatars")
-                                    st.write("Sample avatar:", data['actors'][0] if data['actors'] else "No avatars found")
-                            elif isinstance(data, list):
-                                st.write(f"Found {len(data)} avatars")
-                                st.write("Sample avatar:", data[0] if data else "No avatars found")
-                        except json.JSONDecodeError:
-                            st.error("Could not parse JSON response")
-                            st.code(response.text[:500])
-                    else:
-                        st.error(f"Avatar API error: {response.status_code}")
-                        st.code(response.text[:500])
-                except Exception as e:
-                    st.error(f"Avatar API test failed: {str(e)}")
+                test_catalog_endpoint("actor")
     
     with test_col2:
         if st.button("Test Voice API", use_container_width=True):
             with st.spinner("Testing Voice API..."):
-                try:
-                    response = requests.get(
-                        "https://avatar.pipio.ai/voice",
-                        headers={"Authorization": f"Key {api_key}", "Accept": "application/json"},
-                        timeout=10
-                    )
-                    
-                    st.write(f"Status Code: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        st.success("Voice API connection successful")
-                        try:
-                            data = response.json()
-                            st.write(f"Response Type: {type(data)}")
-                            if isinstance(data, dict):
-                                st.write(f"Keys: {list(data.keys())}")
-                                if 'voices' in data:
-                                    st.write(f"Found {len(data['voices'])} voices")
-                                    st.write("Sample voice:", data['voices'][0] if data['voices'] else "No voices found")
-                            elif isinstance(data, list):
-                                st.write(f"Found {len(data)} voices")
-                                st.write("Sample voice:", data[0] if data else "No voices found")
-                        except json.JSONDecodeError:
-                            st.error("Could not parse JSON response")
-                            st.code(response.text[:500])
-                    else:
-                        st.error(f"Voice API error: {response.status_code}")
-                        st.code(response.text[:500])
-                except Exception as e:
-                    st.error(f"Voice API test failed: {str(e)}")
+                test_catalog_endpoint("voice")
     
     # API Documentation
     st.subheader("API Documentation")
@@ -1200,57 +3191,9 @@ with st.sidebar:
         if test_button:
             st.write("Testing API connection...")
             
-            # Test avatar endpoint
-            try:
-                avatar_response = requests.get(
-                    "https://avatar.pipio.ai/actor",
-                    headers={"Authorization": f"Key {api_key}", "Accept": "application/json"},
-                    timeout=10
-                )
-                st.write(f"Avatar API Status Code: {avatar_response.status_code}")
-                if avatar_response.status_code == 200:
-                    st.success("Avatar API connection successful")
-                    try:
-                        data = avatar_response.json()
-                        st.write(f"Response Type: {type(data)}")
-                        if isinstance(data, dict):
-                            st.write(f"Keys: {list(data.keys())}")
-                        elif isinstance(data, list):
-                            st.write(f"List length: {len(data)}")
-                            if len(data) > 0:
-                                st.write("First item:", data[0])
-                    except:
-                        st.error("Could not parse JSON response")
-                else:
-                    st.error(f"Avatar API error: {avatar_response.status_code}")
-            except Exception as e:
-                st.error(f"Avatar API test failed: {str(e)}")
-            
-            # Test voice endpoint
-            try:
-                voice_response = requests.get(
-                    "https://avatar.pipio.ai/voice",
-                    headers={"Authorization": f"Key {api_key}", "Accept": "application/json"},
-                    timeout=10
-                )
-                st.write(f"Voice API Status Code: {voice_response.status_code}")
-                if voice_response.status_code == 200:
-                    st.success("Voice API connection successful")
-                    try:
-                        data = voice_response.json()
-                        st.write(f"Response Type: {type(data)}")
-                        if isinstance(data, dict):
-                            st.write(f"Keys: {list(data.keys())}")
-                        elif isinstance(data, list):
-                            st.write(f"List length: {len(data)}")
-                            if len(data) > 0:
-                                st.write("First item:", data[0])
-                    except:
-                        st.error("Could not parse JSON response")
-                else:
-                    st.error(f"Voice API error: {voice_response.status_code}")
-            except Exception as e:
-                st.error(f"Voice API test failed: {str(e)}")
+            # Test avatar and voice endpoints
+            test_catalog_endpoint("actor")
+            test_catalog_endpoint("voice")
 
 # Footer
 st.markdown("---")